@@ -6,6 +6,7 @@ from typing import Dict, List, Optional, Tuple, Any
 import json
 import logging
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
@@ -18,6 +19,97 @@ from ml_models import EconomicPredictor
 
 logger = logging.getLogger(__name__)
 
+def _trend_stats(x: np.ndarray, y: np.ndarray) -> Tuple[float, float, float, float]:
+    """
+    Calcula a regressão linear simples de y sobre x em forma fechada
+    
+    Args:
+        x: Array float64 sem NaN (dias desde o início)
+        y: Array float64 sem NaN (valores)
+    
+    Returns:
+        Tuple (inclinação, R², média de y, desvio padrão de y)
+    """
+    n = x.size
+    mean_x = x.sum() / n
+    mean_y = y.sum() / n
+    dx = x - mean_x
+    dy = y - mean_y
+    
+    sxx = dx @ dx
+    syy = dy @ dy
+    sxy = dx @ dy
+    
+    slope = sxy / sxx if sxx > 0 else 0.0
+    r_squared = (sxy * sxy) / (sxx * syy) if sxx > 0 and syy > 0 else 0.0
+    std_y = np.sqrt(syy / n)
+    
+    return slope, r_squared, mean_y, std_y
+
+def _iqr_outliers(v: np.ndarray) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Marca outliers pelo critério de 1,5 x intervalo interquartil
+    
+    Args:
+        v: Array float64 com os valores (NaN nunca é marcado)
+    
+    Returns:
+        Tuple (máscara de outliers, desvio de cada outlier em relação à
+        mediana em desvios padrão, limite superior)
+    """
+    clean = v[~np.isnan(v)]
+    q1, median, q3 = np.percentile(clean, [25, 50, 75])
+    iqr = q3 - q1
+    
+    lower_bound = q1 - 1.5 * iqr
+    upper_bound = q3 + 1.5 * iqr
+    
+    with np.errstate(invalid='ignore'):
+        mask = (v < lower_bound) | (v > upper_bound)
+    
+    # Mediana e desvio calculados uma vez; apenas os outliers são escalados
+    inv_std = 1.0 / clean.std(ddof=1)
+    deviations = np.abs(v[mask] - median) * inv_std
+    
+    return mask, deviations, upper_bound
+
+def _series_arrays(data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Extrai datas e valores de um DataFrame como arrays ordenados por data
+    
+    Args:
+        data: DataFrame com colunas 'date' e 'value'
+    
+    Returns:
+        Tuple (datas datetime64[ns], valores float64) em ordem crescente de data
+    """
+    dates = data['date'].to_numpy(dtype='datetime64[ns]')
+    values = data['value'].to_numpy(dtype=np.float64)
+    
+    # Séries do cache já chegam ordenadas; só reordena quando necessário
+    if len(dates) > 1 and not (dates[1:] >= dates[:-1]).all():
+        order = np.argsort(dates, kind='stable')
+        dates, values = dates[order], values[order]
+    
+    return dates, values
+
+def _slice_period(data: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """
+    Recorta um DataFrame ordenado por data ao intervalo [start, end] por busca binária
+    
+    Args:
+        data: DataFrame com coluna 'date' em ordem crescente
+        start: Data inicial inclusiva (opcional)
+        end: Data final inclusiva (opcional)
+    
+    Returns:
+        Fatia do DataFrame dentro do período
+    """
+    dates = data['date'].to_numpy()
+    first = np.searchsorted(dates, pd.Timestamp(start).to_datetime64(), side='left') if start is not None else 0
+    last = np.searchsorted(dates, pd.Timestamp(end).to_datetime64(), side='right') if end is not None else len(dates)
+    return data.iloc[first:last]
+
 class EconomicAnalyzer:
     """
     Analisador econômico com capacidades de IA para geração de insights
@@ -27,6 +119,55 @@ class EconomicAnalyzer:
         self.db_manager = DatabaseManager()
         self.predictor = EconomicPredictor()
         self.indicator_names = get_indicator_display_names()
+        self._data_cache: Dict[str, Optional[pd.DataFrame]] = {}
+        
+        # Tabela de despacho dos insights específicos por indicador
+        self._specific_insight_fns = {
+            'ipca': self._ipca_insights,
+            'selic': self._selic_insights,
+            'pib': self._pib_insights,
+            'cambio_usd': self._cambio_usd_insights,
+            'divida_pib': self._divida_pib_insights
+        }
+    
+    def _get_data(self, indicator: str) -> Optional[pd.DataFrame]:
+        """
+        Carrega a série completa de um indicador, reaproveitando cargas anteriores
+        
+        Args:
+            indicator: Nome do indicador
+        
+        Returns:
+            DataFrame com os dados do indicador ou None
+        """
+        if indicator not in self._data_cache:
+            self._cache_data(indicator, self.db_manager.load_data(indicator))
+        return self._data_cache[indicator]
+    
+    def _cache_data(self, indicator: str, data: Optional[pd.DataFrame]):
+        """Guarda uma série no cache, garantindo a ordenação por data usada por _slice_period"""
+        if data is not None and not data['date'].is_monotonic_increasing:
+            data = data.sort_values('date', ignore_index=True)
+        self._data_cache[indicator] = data
+    
+    def _preload_data(self, indicators: List[str]):
+        """
+        Carrega em uma única consulta os indicadores que ainda não estão em cache
+        
+        Args:
+            indicators: Lista de indicadores
+        """
+        missing = [indicator for indicator in indicators if indicator not in self._data_cache]
+        if not missing:
+            return
+        
+        loaded = self.db_manager.load_data_multi(missing)
+        for indicator in missing:
+            self._cache_data(indicator, loaded.get(indicator))
+    
+    def clear_cache(self):
+        """Descarta as séries carregadas (início de um novo relatório)"""
+        self._data_cache.clear()
         
     def analyze_trend(self, data: pd.DataFrame, indicator: str) -> Dict[str, Any]:
         """
@@ -42,30 +183,39 @@ class EconomicAnalyzer:
         if data.empty or len(data) < 3:
             return {"trend": "insufficient_data", "confidence": 0.0}
         
-        # Calcular tendência usando regressão linear simples
-        data_sorted = data.sort_values('date').copy()
-        data_sorted['days'] = (data_sorted['date'] - data_sorted['date'].min()).dt.days
+        dates, values = _series_arrays(data)
+        return self._trend_from_arrays(dates, values)
+    
+    def _trend_from_arrays(self, dates: np.ndarray, values: np.ndarray) -> Dict[str, Any]:
+        """
+        Analisa tendência a partir de arrays de datas e valores já ordenados
         
-        # Regressão linear simples
-        x = data_sorted['days'].values
-        y = data_sorted['value'].values
+        Args:
+            dates: Array datetime64[ns] em ordem crescente
+            values: Array float64 alinhado às datas
         
-        # Remover NaN
-        mask = ~(np.isnan(x) | np.isnan(y))
-        x, y = x[mask], y[mask]
+        Returns:
+            Dict com análise da tendência
+        """
+        if len(dates) < 3:
+            return {"trend": "insufficient_data", "confidence": 0.0}
+        
+        # Remover NaT/NaN antes da conversão: NaT vira um float negativo
+        # enorme (não NaN) ao passar por timedelta -> float64
+        mask = ~(np.isnat(dates) | np.isnan(values))
+        dates, y = dates[mask], values[mask]
         
-        if len(x) < 2:
+        if len(y) < 2:
             return {"trend": "insufficient_data", "confidence": 0.0}
         
-        # Calcular coeficiente angular
-        slope = np.polyfit(x, y, 1)[0]
+        # Dias desde a primeira observação válida
+        x = (dates - dates[0]).astype('timedelta64[D]').astype(np.float64)
         
-        # Calcular R²
-        correlation = np.corrcoef(x, y)[0, 1] if len(x) > 1 else 0
-        r_squared = correlation ** 2
+        # Coeficiente angular, R², média e desvio em uma única passada
+        slope, r_squared, mean_y, std_y = _trend_stats(x, y)
         
         # Determinar tendência
-        threshold = np.std(y) * 0.01  # 1% do desvio padrão como threshold
+        threshold = std_y * 0.01  # 1% do desvio padrão como threshold
         
         if abs(slope) < threshold:
             trend_direction = "stable"
@@ -81,7 +231,7 @@ class EconomicAnalyzer:
             recent_change = 0
         
         # Calcular volatilidade
-        volatility = np.std(y) / np.mean(y) * 100 if np.mean(y) != 0 else 0
+        volatility = std_y / mean_y * 100 if mean_y != 0 else 0
         
         return {
             "trend": trend_direction,
@@ -93,41 +243,88 @@ class EconomicAnalyzer:
             "last_value": y[-1] if len(y) > 0 else None
         }
     
-    def detect_outliers(self, data: pd.DataFrame) -> List[Dict]:
+    def detect_outliers(self, data: pd.DataFrame, return_dates: bool = False, last_only: bool = False):
         """
         Detecta outliers nos dados usando IQR
         
         Args:
             data: DataFrame com dados
+            return_dates: Se True, retorna também as datas dos outliers como ndarray
+            last_only: Se True, monta apenas o outlier mais recente
         
         Returns:
-            Lista de outliers detectados
+            Lista de outliers detectados, ou Tuple (lista, datas datetime64)
+            quando return_dates=True, ou Tuple (quantidade de outliers,
+            outlier mais recente ou None) quando last_only=True
         """
         if data.empty:
-            return []
-        
-        values = data['value'].dropna()
-        if len(values) < 4:
-            return []
+            return self._outliers_from_arrays(
+                np.array([], dtype='datetime64[ns]'), np.array([], dtype=np.float64),
+                return_dates, last_only
+            )
         
-        Q1 = values.quantile(0.25)
-        Q3 = values.quantile(0.75)
-        IQR = Q3 - Q1
+        return self._outliers_from_arrays(
+            data['date'].to_numpy(dtype='datetime64[ns]'),
+            data['value'].to_numpy(dtype=np.float64),
+            return_dates, last_only
+        )
+    
+    def _outliers_from_arrays(self, dates: np.ndarray, v: np.ndarray,
+                              return_dates: bool = False, last_only: bool = False):
+        """
+        Detecta outliers por IQR a partir de arrays de datas e valores
         
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
+        Args:
+            dates: Array datetime64[ns] alinhado aos valores
+            v: Array float64 com os valores
+            return_dates: Ver detect_outliers
+            last_only: Ver detect_outliers
         
-        outliers = []
-        for idx, row in data.iterrows():
-            value = row['value']
-            if pd.notna(value) and (value < lower_bound or value > upper_bound):
-                outliers.append({
-                    'date': row['date'],
-                    'value': value,
-                    'type': 'high' if value > upper_bound else 'low',
-                    'deviation': abs(value - values.median()) / values.std()
-                })
+        Returns:
+            Mesmo formato de detect_outliers
+        """
+        if last_only:
+            no_outliers = (0, None)
+        elif return_dates:
+            no_outliers = ([], np.array([], dtype='datetime64[ns]'))
+        else:
+            no_outliers = []
+        
+        # Quartis, máscara e desvios calculados de uma vez sobre o ndarray
+        if np.count_nonzero(~np.isnan(v)) < 4:
+            return no_outliers
+        
+        mask, deviations, upper_bound = _iqr_outliers(v)
+        if not mask.any():
+            return no_outliers
+        
+        if last_only:
+            # Localiza o mais recente sem materializar os demais
+            positions = np.flatnonzero(mask)
+            last = int(np.argmax(dates[positions]))
+            position = positions[last]
+            value = float(v[position])
+            return len(positions), {
+                'date': pd.Timestamp(dates[position]),
+                'value': value,
+                'type': 'high' if value > upper_bound else 'low',
+                'deviation': float(deviations[last])
+            }
+        
+        outlier_values = v[mask]
+        outlier_dates = dates[mask]
+        types = np.where(outlier_values > upper_bound, 'high', 'low')
+        
+        outliers = [
+            {'date': date, 'value': value, 'type': kind, 'deviation': deviation}
+            for date, value, kind, deviation in zip(
+                pd.DatetimeIndex(outlier_dates), outlier_values.tolist(),
+                types.tolist(), deviations.tolist()
+            )
+        ]
         
+        if return_dates:
+            return outliers, outlier_dates
         return outliers
     
     def analyze_correlation(self, indicators: List[str], period_months: int = 12) -> Dict[str, Dict]:
@@ -144,39 +341,50 @@ class EconomicAnalyzer:
         end_date = datetime.now()
         start_date = end_date - timedelta(days=30 * period_months)
         
-        # Carregar dados
+        start_day = pd.Timestamp(start_date).normalize()
+        
+        # Carregar dados (filtrando o período em memória sobre a série em cache)
+        self._preload_data(indicators)
         data_dict = {}
         for indicator in indicators:
-            data = self.db_manager.load_data(
-                indicator, 
-                start_date.strftime('%Y-%m-%d'),
-                end_date.strftime('%Y-%m-%d')
-            )
-            if data is not None and not data.empty:
-                data_dict[indicator] = data.set_index('date')['value']
+            data = self._get_data(indicator)
+            if data is None or data.empty:
+                continue
+            
+            data = _slice_period(data, start_day, end_date)
+            if not data.empty:
+                # Grade mensal comum: séries diárias e mensais ficam alinhadas
+                data_dict[indicator] = (
+                    data.set_index('date')['value']
+                    .astype(np.float64)
+                    .resample('MS')
+                    .last()
+                )
         
         if len(data_dict) < 2:
             return {}
         
-        # Criar DataFrame combinado
+        # Criar DataFrame combinado (só séries trimestrais/irregulares deixam lacunas)
         combined_df = pd.DataFrame(data_dict)
-        combined_df = combined_df.fillna(method='ffill').fillna(method='bfill')
+        combined_df = combined_df.ffill().bfill()
         
-        # Calcular matriz de correlação
-        correlation_matrix = combined_df.corr()
+        # Calcular matriz de correlação (colunas seguem a ordem de indicators)
+        columns = list(combined_df.columns)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlation_matrix = np.corrcoef(combined_df.to_numpy(dtype=np.float64), rowvar=False)
         
         # Analisar correlações significativas
         correlations = {}
-        for i, ind1 in enumerate(indicators):
-            for j, ind2 in enumerate(indicators):
-                if i < j and ind1 in correlation_matrix.index and ind2 in correlation_matrix.columns:
-                    corr_value = correlation_matrix.loc[ind1, ind2]
-                    if abs(corr_value) > 0.3:  # Correlação moderada ou forte
-                        correlations[f"{ind1}_{ind2}"] = {
-                            'correlation': corr_value,
-                            'strength': self._classify_correlation(abs(corr_value)),
-                            'direction': 'positive' if corr_value > 0 else 'negative'
-                        }
+        n_columns = len(columns)
+        for i in range(n_columns):
+            for j in range(i + 1, n_columns):
+                corr_value = correlation_matrix[i, j]
+                if abs(corr_value) > 0.3:  # Correlação moderada ou forte
+                    correlations[f"{columns[i]}_{columns[j]}"] = {
+                        'correlation': corr_value,
+                        'strength': self._classify_correlation(abs(corr_value)),
+                        'direction': 'positive' if corr_value > 0 else 'negative'
+                    }
         
         return correlations
     
@@ -203,12 +411,16 @@ class EconomicAnalyzer:
             Lista de insights gerados
         """
         insights = []
+        max_insights = config.reports.max_insights_per_indicator
         
         if data.empty:
             return ["Dados insuficientes para análise."]
         
+        # Datas e valores extraídos e ordenados uma única vez para todas as análises
+        dates, values = _series_arrays(data)
+        
         # Análise de tendência
-        trend_analysis = self.analyze_trend(data, indicator)
+        trend_analysis = self._trend_from_arrays(dates, values)
         
         # Insight sobre tendência
         if trend_analysis["confidence"] > 0.5:
@@ -241,26 +453,32 @@ class EconomicAnalyzer:
                 "sugerindo comportamento estável."
             )
         
+        # Limite de insights já atingido: as análises seguintes não seriam usadas
+        if len(insights) >= max_insights:
+            return insights[:max_insights]
+        
         # Análise de outliers
-        outliers = self.detect_outliers(data)
-        if outliers:
-            if len(outliers) > len(data) * 0.1:  # Mais de 10% são outliers
+        outlier_count, last_outlier = self._outliers_from_arrays(dates, values, last_only=True)
+        if outlier_count:
+            if outlier_count > len(data) * 0.1:  # Mais de 10% são outliers
                 insights.append(
-                    f"Detectados {len(outliers)} valores atípicos, "
+                    f"Detectados {outlier_count} valores atípicos, "
                     "sugerindo eventos extraordinários no período."
                 )
             else:
-                last_outlier = max(outliers, key=lambda x: x['date'])
                 insights.append(
                     f"Último valor atípico detectado em {last_outlier['date'].strftime('%d/%m/%Y')}: "
                     f"{last_outlier['value']:.2f} ({last_outlier['type']} extremo)."
                 )
         
+        if len(insights) >= max_insights:
+            return insights[:max_insights]
+        
         # Análise específica por indicador
         indicator_insights = self._get_indicator_specific_insights(indicator, data, trend_analysis)
         insights.extend(indicator_insights)
         
-        return insights[:config.reports.max_insights_per_indicator]
+        return insights[:max_insights]
     
     def _get_indicator_specific_insights(self, indicator: str, data: pd.DataFrame, trend_analysis: Dict) -> List[str]:
         """
@@ -274,48 +492,59 @@ class EconomicAnalyzer:
         Returns:
             Lista de insights específicos
         """
-        insights = []
-        last_value = trend_analysis.get("last_value")
-        
-        if indicator == 'ipca':
-            if last_value is not None:
-                if last_value > 6:
-                    insights.append("A inflação está acima da meta superior (6%), indicando pressões inflacionárias.")
-                elif last_value < 3:
-                    insights.append("A inflação está abaixo da meta inferior (3%), podendo indicar desaceleração econômica.")
-                else:
-                    insights.append("A inflação está dentro da meta (3-6%), sinalizando estabilidade de preços.")
-        
-        elif indicator == 'selic':
-            if last_value is not None:
-                if trend_analysis["trend"] == "ascending":
-                    insights.append("A elevação da taxa Selic indica política monetária contracionista para combater inflação.")
-                elif trend_analysis["trend"] == "descending":
-                    insights.append("A redução da taxa Selic sugere estímulo econômico e expectativa de inflação controlada.")
-        
-        elif indicator == 'pib':
-            if trend_analysis["trend"] == "ascending":
-                insights.append("O crescimento do PIB indica expansão da atividade econômica.")
-            elif trend_analysis["trend"] == "descending":
-                insights.append("A contração do PIB pode sinalizar desaceleração ou recessão econômica.")
-        
-        elif indicator == 'cambio_usd':
-            if last_value is not None:
-                recent_change = trend_analysis.get("recent_change_pct", 0)
-                if abs(recent_change) > 10:
-                    if recent_change > 0:
-                        insights.append("A forte desvalorização do real pode pressionar a inflação e aumentar custos de importação.")
-                    else:
-                        insights.append("A valorização do real pode beneficiar importadores e reduzir pressões inflacionárias.")
-        
-        elif indicator == 'divida_pib':
-            if last_value is not None:
-                if last_value > 80:
-                    insights.append("A relação Dívida/PIB elevada (>80%) pode limitar o espaço fiscal do governo.")
-                elif trend_analysis["trend"] == "ascending":
-                    insights.append("O crescimento da dívida pública requer atenção à sustentabilidade fiscal.")
-        
-        return insights
+        insight_fn = self._specific_insight_fns.get(indicator)
+        if insight_fn is None:
+            return []
+        return insight_fn(trend_analysis.get("last_value"), trend_analysis)
+    
+    def _ipca_insights(self, last_value: Optional[float], trend_analysis: Dict) -> List[str]:
+        """Insights de inflação em relação à meta"""
+        if last_value is None:
+            return []
+        if last_value > 6:
+            return ["A inflação está acima da meta superior (6%), indicando pressões inflacionárias."]
+        if last_value < 3:
+            return ["A inflação está abaixo da meta inferior (3%), podendo indicar desaceleração econômica."]
+        return ["A inflação está dentro da meta (3-6%), sinalizando estabilidade de preços."]
+    
+    def _selic_insights(self, last_value: Optional[float], trend_analysis: Dict) -> List[str]:
+        """Insights de política monetária a partir da tendência da Selic"""
+        if last_value is None:
+            return []
+        if trend_analysis["trend"] == "ascending":
+            return ["A elevação da taxa Selic indica política monetária contracionista para combater inflação."]
+        if trend_analysis["trend"] == "descending":
+            return ["A redução da taxa Selic sugere estímulo econômico e expectativa de inflação controlada."]
+        return []
+    
+    def _pib_insights(self, last_value: Optional[float], trend_analysis: Dict) -> List[str]:
+        """Insights de atividade econômica a partir da tendência do PIB"""
+        if trend_analysis["trend"] == "ascending":
+            return ["O crescimento do PIB indica expansão da atividade econômica."]
+        if trend_analysis["trend"] == "descending":
+            return ["A contração do PIB pode sinalizar desaceleração ou recessão econômica."]
+        return []
+    
+    def _cambio_usd_insights(self, last_value: Optional[float], trend_analysis: Dict) -> List[str]:
+        """Insights de câmbio para variações fortes do dólar"""
+        if last_value is None:
+            return []
+        recent_change = trend_analysis.get("recent_change_pct", 0)
+        if abs(recent_change) <= 10:
+            return []
+        if recent_change > 0:
+            return ["A forte desvalorização do real pode pressionar a inflação e aumentar custos de importação."]
+        return ["A valorização do real pode beneficiar importadores e reduzir pressões inflacionárias."]
+    
+    def _divida_pib_insights(self, last_value: Optional[float], trend_analysis: Dict) -> List[str]:
+        """Insights de sustentabilidade fiscal da relação Dívida/PIB"""
+        if last_value is None:
+            return []
+        if last_value > 80:
+            return ["A relação Dívida/PIB elevada (>80%) pode limitar o espaço fiscal do governo."]
+        if trend_analysis["trend"] == "ascending":
+            return ["O crescimento da dívida pública requer atenção à sustentabilidade fiscal."]
+        return []
 
 
 class ReportGenerator:
@@ -325,7 +554,7 @@ class ReportGenerator:
     
     def __init__(self):
         self.analyzer = EconomicAnalyzer()
-        self.predictor = EconomicPredictor()
+        self.predictor = self.analyzer.predictor  # Uma única instância por relatório
         self.reports_dir = Path(config.reports.output_dir)
         self.reports_dir.mkdir(exist_ok=True)
     
@@ -339,6 +568,9 @@ class ReportGenerator:
         Returns:
             Dict com relatório completo
         """
+        # Cada relatório parte de uma leitura nova do banco
+        self.analyzer.clear_cache()
+        
         report = {
             'title': 'Panorama Econômico Brasileiro',
             'generated_at': datetime.now(),
@@ -348,27 +580,20 @@ class ReportGenerator:
         
         # Indicadores principais para análise
         main_indicators = ['ipca', 'selic', 'pib', 'cambio_usd', 'divida_pib']
-        
-        # Seção 1: Análise de Indicadores Principais
-        indicators_section = {}
-        for indicator in main_indicators:
-            data = self.analyzer.db_manager.load_data(indicator)
-            if data is not None and not data.empty:
-                # Últimos N meses
-                cutoff_date = datetime.now() - timedelta(days=30 * months_back)
-                recent_data = data[data['date'] >= cutoff_date]
-                
-                if not recent_data.empty:
-                    trend_analysis = self.analyzer.analyze_trend(recent_data, indicator)
-                    insights = self.analyzer.generate_insights(indicator, recent_data)
-                    
-                    indicators_section[indicator] = {
-                        'name': self.analyzer.indicator_names.get(indicator, indicator),
-                        'trend_analysis': trend_analysis,
-                        'insights': insights,
-                        'last_value': recent_data['value'].iloc[-1] if len(recent_data) > 0 else None,
-                        'last_date': recent_data['date'].iloc[-1] if len(recent_data) > 0 else None
-                    }
+        self.analyzer._preload_data(main_indicators)
+        
+        # Seção 1: Análise de Indicadores Principais (indicadores independentes, em paralelo)
+        with ThreadPoolExecutor(max_workers=len(main_indicators)) as executor:
+            sections = list(executor.map(
+                lambda indicator: self._process_indicator(indicator, months_back),
+                main_indicators
+            ))
+        
+        indicators_section = {
+            indicator: section
+            for indicator, section in zip(main_indicators, sections)
+            if section is not None
+        }
         
         report['sections']['indicators'] = indicators_section
         
@@ -377,17 +602,15 @@ class ReportGenerator:
         report['sections']['correlations'] = correlations
         
         # Seção 3: Previsões
-        predictions_section = {}
-        for indicator in ['ipca', 'selic', 'pib']:
-            try:
-                prediction = self.predictor.predict_future(indicator, steps=6)
-                if prediction is not None:
-                    predictions_section[indicator] = {
-                        'forecast': prediction.to_dict('records'),
-                        'trend_forecast': 'ascending' if prediction['value'].iloc[-1] > prediction['value'].iloc[0] else 'descending'
-                    }
-            except Exception as e:
-                logger.warning(f"Erro ao gerar previsão para {indicator}: {e}")
+        prediction_indicators = ['ipca', 'selic', 'pib']
+        with ThreadPoolExecutor(max_workers=len(prediction_indicators)) as executor:
+            predictions = list(executor.map(self._process_prediction, prediction_indicators))
+        
+        predictions_section = {
+            indicator: prediction
+            for indicator, prediction in zip(prediction_indicators, predictions)
+            if prediction is not None
+        }
         
         report['sections']['predictions'] = predictions_section
         
@@ -397,6 +620,60 @@ class ReportGenerator:
         
         return report
     
+    def _process_indicator(self, indicator: str, months_back: int) -> Optional[Dict[str, Any]]:
+        """
+        Monta a seção de análise de um indicador
+        
+        Args:
+            indicator: Nome do indicador
+            months_back: Meses para análise retroativa
+        
+        Returns:
+            Dict com a seção do indicador ou None se não houver dados
+        """
+        data = self.analyzer._get_data(indicator)
+        if data is None or data.empty:
+            return None
+        
+        # Últimos N meses
+        cutoff_date = datetime.now() - timedelta(days=30 * months_back)
+        recent_data = _slice_period(data, cutoff_date)
+        
+        if recent_data.empty:
+            return None
+        
+        trend_analysis = self.analyzer.analyze_trend(recent_data, indicator)
+        insights = self.analyzer.generate_insights(indicator, recent_data)
+        
+        return {
+            'name': self.analyzer.indicator_names.get(indicator, indicator),
+            'trend_analysis': trend_analysis,
+            'insights': insights,
+            'last_value': recent_data['value'].iloc[-1],
+            'last_date': recent_data['date'].iloc[-1]
+        }
+    
+    def _process_prediction(self, indicator: str) -> Optional[Dict[str, Any]]:
+        """
+        Gera a previsão de um indicador para a seção de previsões
+        
+        Args:
+            indicator: Nome do indicador
+        
+        Returns:
+            Dict com a previsão ou None em caso de falha
+        """
+        try:
+            prediction = self.predictor.predict_future(indicator, steps=6)
+            if prediction is not None:
+                return {
+                    'forecast': prediction.to_dict('records'),
+                    'trend_forecast': 'ascending' if prediction['value'].iloc[-1] > prediction['value'].iloc[0] else 'descending'
+                }
+        except Exception as e:
+            logger.warning(f"Erro ao gerar previsão para {indicator}: {e}")
+        return None
+    
     def _generate_executive_summary(self, report: Dict[str, Any]) -> List[str]:
         """
         Gera resumo executivo baseado na análise
@@ -498,26 +775,34 @@ class ReportGenerator:
         
         indicators_to_plot = ['ipca', 'selic', 'pib', 'cambio_usd']
         positions = [(1, 1), (1, 2), (2, 1), (2, 2)]
+        self.analyzer._preload_data(indicators_to_plot)
         
+        # Últimos 24 meses
+        cutoff_date = datetime.now() - timedelta(days=730)
+        
+        traces, trace_rows, trace_cols = [], [], []
         for i, indicator in enumerate(indicators_to_plot):
-            data = self.analyzer.db_manager.load_data(indicator)
+            data = self.analyzer._get_data(indicator)
             if data is not None and not data.empty:
                 row, col = positions[i]
-                
-                # Últimos 24 meses
-                cutoff_date = datetime.now() - timedelta(days=730)
-                recent_data = data[data['date'] >= cutoff_date].sort_values('date')
+                recent_data = _slice_period(data, cutoff_date)
                 
                 if not recent_data.empty:
-                    fig.add_trace(
-                        go.Scatter(
+                    # Scattergl renderiza via WebGL, escalando melhor em séries longas
+                    traces.append(
+                        go.Scattergl(
                             x=recent_data['date'],
                             y=recent_data['value'],
                             name=self.analyzer.indicator_names.get(indicator, indicator),
                             line=dict(width=2)
-                        ),
-                        row=row, col=col
+                        )
                     )
+                    trace_rows.append(row)
+                    trace_cols.append(col)
+        
+        # Adicionar todos os traces em uma única chamada
+        if traces:
+            fig.add_traces(traces, rows=trace_rows, cols=trace_cols)
         
         # Atualizar layout
         fig.update_layout(
@@ -531,7 +816,8 @@ class ReportGenerator:
         filename = f"relatorio_economico_{timestamp}.html"
         filepath = self.reports_dir / filename
         
-        fig.write_html(str(filepath))
+        # plotly.js via CDN evita embutir ~3 MB em cada relatório
+        fig.write_html(str(filepath), include_plotlyjs='cdn', full_html=True)
         
         return str(filepath)
     
@@ -545,31 +831,21 @@ class ReportGenerator:
         Returns:
             Caminho do arquivo JSON
         """
-        # Converter datetime para string para serialização JSON
+        # Converter datetime para string para serialização JSON; o json só chama
+        # esta função para objetos que não sabe serializar
         def convert_datetime(obj):
-            if isinstance(obj, datetime):
-                return obj.isoformat()
-            elif isinstance(obj, pd.Timestamp):
+            if isinstance(obj, (datetime, pd.Timestamp)):
                 return obj.isoformat()
-            return obj
-        
-        # Função recursiva para converter datetimes
-        def convert_datetimes_recursive(data):
-            if isinstance(data, dict):
-                return {k: convert_datetimes_recursive(v) for k, v in data.items()}
-            elif isinstance(data, list):
-                return [convert_datetimes_recursive(item) for item in data]
-            else:
-                return convert_datetime(data)
-        
-        converted_data = convert_datetimes_recursive(report_data)
+            elif isinstance(obj, np.generic):
+                return obj.item()
+            raise TypeError(f"Objeto do tipo {type(obj).__name__} não é serializável em JSON")
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"relatorio_dados_{timestamp}.json"
         filepath = self.reports_dir / filename
         
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(converted_data, f, ensure_ascii=False, indent=2)
+            json.dump(report_data, f, ensure_ascii=False, indent=2, default=convert_datetime)
         
         return str(filepath)
 
@@ -1,10 +1,12 @@
 # config.py - Configuração centralizada do sistema
 import os
+import types
 from dataclasses import dataclass
-from typing import Dict, List
-from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import List, Mapping, Tuple
+from datetime import date, datetime, timedelta
 
-@dataclass
+@dataclass(slots=True)
 class DatabaseConfig:
     """Configurações do banco de dados"""
     db_path: str = "data/economic_data.db"
@@ -12,7 +14,91 @@ class DatabaseConfig:
     backup_enabled: bool = True
     backup_frequency_days: int = 7
 
-@dataclass
+# Mapeamento completo de indicadores BCB (padrão de DataCollectionConfig).
+# Somente leitura e compartilhado entre instâncias/processos; quem precisar
+# alterar deve copiar explicitamente, ex.: dict(config.data_collection.indicators)
+_INDICATORS_DEFAULT = types.MappingProxyType({
+    'ipca': types.MappingProxyType({
+        'series_id': 433,
+        'name': 'Inflação (IPCA)',
+        'unit': '%',
+        'frequency': 'monthly',
+        'description': 'Índice Nacional de Preços ao Consumidor Amplo'
+    }),
+    'pib': types.MappingProxyType({
+        'series_id': 4380,
+        'name': 'PIB Real',
+        'unit': 'Índice',
+        'frequency': 'quarterly',
+        'description': 'Produto Interno Bruto a preços constantes'
+    }),
+    'divida_pib': types.MappingProxyType({
+        'series_id': 13761,
+        'name': 'Dívida/PIB',
+        'unit': '%',
+        'frequency': 'monthly',
+        'description': 'Dívida Líquida do Setor Público/PIB'
+    }),
+    'selic': types.MappingProxyType({
+        'series_id': 11,
+        'name': 'Taxa SELIC Diária',
+        'unit': '% a.a.',
+        'frequency': 'daily',
+        'description': 'Taxa de juros - Over/Selic - Taxa acumulada no mês'
+    }),
+    'selic_meta': types.MappingProxyType({
+        'series_id': 4189,
+        'name': 'Meta da Taxa SELIC',
+        'unit': '% a.a.',
+        'frequency': 'irregular',
+        'description': 'Taxa de juros - Meta Selic definida pelo Copom'
+    }),
+    'transacoes': types.MappingProxyType({
+        'series_id': 22707,
+        'name': 'Saldo em Transações Correntes',
+        'unit': 'US$ milhões',
+        'frequency': 'monthly',
+        'description': 'Balanço de Pagamentos - Saldo em Transações Correntes'
+    }),
+    'resultado_primario': types.MappingProxyType({
+        'series_id': 7547,
+        'name': 'Resultado Primário',
+        'unit': 'R$ milhões',
+        'frequency': 'monthly',
+        'description': 'Indicadores Fiscais - Resultado Primário do Governo Central'
+    }),
+    # Novos indicadores para análise mais completa
+    'igpm': types.MappingProxyType({
+        'series_id': 189,
+        'name': 'IGP-M',
+        'unit': '%',
+        'frequency': 'monthly',
+        'description': 'Índice Geral de Preços do Mercado'
+    }),
+    'inpc': types.MappingProxyType({
+        'series_id': 188,
+        'name': 'INPC',
+        'unit': '%',
+        'frequency': 'monthly',
+        'description': 'Índice Nacional de Preços ao Consumidor'
+    }),
+    'cambio_usd': types.MappingProxyType({
+        'series_id': 1,
+        'name': 'Taxa de Câmbio USD',
+        'unit': 'R$/US$',
+        'frequency': 'daily',
+        'description': 'Taxa de câmbio - R$ / US$ - comercial - compra'
+    }),
+    'reservas_internacionais': types.MappingProxyType({
+        'series_id': 3546,
+        'name': 'Reservas Internacionais',
+        'unit': 'US$ milhões',
+        'frequency': 'daily',
+        'description': 'Reservas Internacionais - Total'
+    })
+})
+
+@dataclass(slots=True)
 class DataCollectionConfig:
     """Configurações para coleta de dados"""
     default_years: int = 10  # Aumentado para 10 anos
@@ -24,93 +110,15 @@ class DataCollectionConfig:
     # URLs das APIs
     bcb_base_url: str = "https://api.bcb.gov.br/dados/serie/bcdata.sgs"
     
-    # Mapeamento completo de indicadores BCB
-    indicators: Dict[str, Dict] = None
+    # Mapeamento completo de indicadores BCB (somente leitura por padrão)
+    indicators: Mapping[str, Mapping] = None
     
     def __post_init__(self):
+        # Padrão compartilhado, sem recriar o dicionário a cada instância
         if self.indicators is None:
-            self.indicators = {
-                'ipca': {
-                    'series_id': 433,
-                    'name': 'Inflação (IPCA)',
-                    'unit': '%',
-                    'frequency': 'monthly',
-                    'description': 'Índice Nacional de Preços ao Consumidor Amplo'
-                },
-                'pib': {
-                    'series_id': 4380,
-                    'name': 'PIB Real',
-                    'unit': 'Índice',
-                    'frequency': 'quarterly',
-                    'description': 'Produto Interno Bruto a preços constantes'
-                },
-                'divida_pib': {
-                    'series_id': 13761,
-                    'name': 'Dívida/PIB',
-                    'unit': '%',
-                    'frequency': 'monthly',
-                    'description': 'Dívida Líquida do Setor Público/PIB'
-                },
-                'selic': {
-                    'series_id': 11,
-                    'name': 'Taxa SELIC Diária',
-                    'unit': '% a.a.',
-                    'frequency': 'daily',
-                    'description': 'Taxa de juros - Over/Selic - Taxa acumulada no mês'
-                },
-                'selic_meta': {
-                    'series_id': 4189,
-                    'name': 'Meta da Taxa SELIC',
-                    'unit': '% a.a.',
-                    'frequency': 'irregular',
-                    'description': 'Taxa de juros - Meta Selic definida pelo Copom'
-                },
-                'transacoes': {
-                    'series_id': 22707,
-                    'name': 'Saldo em Transações Correntes',
-                    'unit': 'US$ milhões',
-                    'frequency': 'monthly',
-                    'description': 'Balanço de Pagamentos - Saldo em Transações Correntes'
-                },
-                'resultado_primario': {
-                    'series_id': 7547,
-                    'name': 'Resultado Primário',
-                    'unit': 'R$ milhões',
-                    'frequency': 'monthly',
-                    'description': 'Indicadores Fiscais - Resultado Primário do Governo Central'
-                },
-                # Novos indicadores para análise mais completa
-                'igpm': {
-                    'series_id': 189,
-                    'name': 'IGP-M',
-                    'unit': '%',
-                    'frequency': 'monthly',
-                    'description': 'Índice Geral de Preços do Mercado'
-                },
-                'inpc': {
-                    'series_id': 188,
-                    'name': 'INPC',
-                    'unit': '%',
-                    'frequency': 'monthly',
-                    'description': 'Índice Nacional de Preços ao Consumidor'
-                },
-                'cambio_usd': {
-                    'series_id': 1,
-                    'name': 'Taxa de Câmbio USD',
-                    'unit': 'R$/US$',
-                    'frequency': 'daily',
-                    'description': 'Taxa de câmbio - R$ / US$ - comercial - compra'
-                },
-                'reservas_internacionais': {
-                    'series_id': 3546,
-                    'name': 'Reservas Internacionais',
-                    'unit': 'US$ milhões',
-                    'frequency': 'daily',
-                    'description': 'Reservas Internacionais - Total'
-                }
-            }
+            self.indicators = _INDICATORS_DEFAULT
 
-@dataclass
+@dataclass(slots=True)
 class MLConfig:
     """Configurações para Machine Learning"""
     models_dir: str = "models"
@@ -141,7 +149,7 @@ class MLConfig:
                 'lstm'  # Para implementação futura
             ]
 
-@dataclass
+@dataclass(slots=True)
 class ReportConfig:
     """Configurações para geração de relatórios"""
     template_dir: str = "templates"
@@ -166,33 +174,38 @@ class ReportConfig:
                 'custom_analysis'
             ]
 
-@dataclass
 class AppConfig:
-    """Configuração principal da aplicação"""
-    # Versão do sistema
-    version: str = "2.0.0"
-    debug_mode: bool = False
-    
-    # Configurações de módulos
-    database: DatabaseConfig = None
-    data_collection: DataCollectionConfig = None
-    ml: MLConfig = None
-    reports: ReportConfig = None
-    
-    # Configurações do Streamlit
-    page_title: str = "Sistema de Análise Econômica - BCB"
-    page_icon: str = "📊"
-    layout: str = "wide"
+    """
+    Configuração principal da aplicação
     
-    def __post_init__(self):
-        if self.database is None:
-            self.database = DatabaseConfig()
-        if self.data_collection is None:
-            self.data_collection = DataCollectionConfig()
-        if self.ml is None:
-            self.ml = MLConfig()
-        if self.reports is None:
-            self.reports = ReportConfig()
+    Classe simples com __init__ escrito à mão (em vez de dataclass), pois é
+    instanciada na importação deste módulo por todos os scripts.
+    """
+    __slots__ = (
+        'version', 'debug_mode',
+        'database', 'data_collection', 'ml', 'reports',
+        'page_title', 'page_icon', 'layout'
+    )
+    
+    def __init__(self, version: str = "2.0.0", debug_mode: bool = False,
+                 database: DatabaseConfig = None, data_collection: DataCollectionConfig = None,
+                 ml: MLConfig = None, reports: ReportConfig = None,
+                 page_title: str = "Sistema de Análise Econômica - BCB",
+                 page_icon: str = "📊", layout: str = "wide"):
+        # Versão do sistema
+        self.version = version
+        self.debug_mode = debug_mode
+        
+        # Configurações de módulos
+        self.database = DatabaseConfig() if database is None else database
+        self.data_collection = DataCollectionConfig() if data_collection is None else data_collection
+        self.ml = MLConfig() if ml is None else ml
+        self.reports = ReportConfig() if reports is None else reports
+        
+        # Configurações do Streamlit
+        self.page_title = page_title
+        self.page_icon = page_icon
+        self.layout = layout
         
         # Criar diretórios necessários
         self._create_directories()
@@ -208,15 +221,20 @@ class AppConfig:
             self.reports.output_dir
         ]
         
+        # makedirs com exist_ok já é idempotente; dispensa o os.path.exists
         for directory in directories:
-            if directory and not os.path.exists(directory):
+            if directory:
                 os.makedirs(directory, exist_ok=True)
 
 # Instância global de configuração
 config = AppConfig()
 
+# Visões somente leitura dos indicadores, fixos após a inicialização
+_INDICATOR_INFO = types.MappingProxyType(config.data_collection.indicators)
+_EMPTY = types.MappingProxyType({})
+
 # Funções utilitárias
-def get_indicator_info(indicator_key: str) -> Dict:
+def get_indicator_info(indicator_key: str) -> Mapping:
     """
     Retorna informações sobre um indicador específico
     
@@ -224,35 +242,64 @@ def get_indicator_info(indicator_key: str) -> Dict:
         indicator_key: Chave do indicador (ex: 'ipca', 'selic')
     
     Returns:
-        Dict com informações do indicador
+        Mapeamento (somente leitura se ausente) com informações do indicador
     """
-    return config.data_collection.indicators.get(indicator_key, {})
+    return _INDICATOR_INFO.get(indicator_key, _EMPTY)
 
-def get_available_indicators() -> List[str]:
+@lru_cache(maxsize=1)
+def get_available_indicators() -> Tuple[str, ...]:
     """
-    Retorna lista de indicadores disponíveis
+    Retorna os indicadores disponíveis
+    
+    Calculado uma única vez e compartilhado entre chamadas, por isso imutável;
+    quem precisar alterar deve copiar, ex.: list(get_available_indicators()).
     
     Returns:
-        Lista com chaves dos indicadores
+        Tupla com chaves dos indicadores
     """
-    return list(config.data_collection.indicators.keys())
+    return tuple(config.data_collection.indicators.keys())
 
-def get_indicator_display_names() -> Dict[str, str]:
+@lru_cache(maxsize=1)
+def get_indicator_display_names() -> Mapping[str, str]:
     """
     Retorna mapeamento de chaves para nomes de exibição
     
+    Calculado uma única vez e compartilhado entre chamadas (dashboard, ML e
+    relatórios), por isso somente leitura; quem precisar alterar deve copiar,
+    ex.: dict(get_indicator_display_names()).
+    
     Returns:
-        Dict mapeando chave -> nome para exibição
+        Mapeamento somente leitura chave -> nome para exibição
     """
-    return {
+    return types.MappingProxyType({
         key: info.get('name', key) 
         for key, info in config.data_collection.indicators.items()
-    }
+    })
+
+@lru_cache(maxsize=8)
+def _get_date_range_cached(years: int, today_ordinal: int) -> tuple:
+    """
+    Calcula o range de datas para um dia específico
+    
+    Args:
+        years: Número de anos retroativos
+        today_ordinal: Data de referência como ordinal (date.toordinal)
+    
+    Returns:
+        Tuple (start_date, end_date) em formato string DD/MM/AAAA
+    """
+    end = date.fromordinal(today_ordinal)
+    start = end - timedelta(days=365 * years)
+    
+    return start.strftime('%d/%m/%Y'), end.strftime('%d/%m/%Y')
 
 def get_date_range(years: int = None) -> tuple:
     """
     Calcula range de datas para coleta
     
+    O resultado só muda de um dia para o outro, então é memoizado por
+    (anos, data atual).
+    
     Args:
         years: Número de anos retroativos (opcional)
     
@@ -262,10 +309,7 @@ def get_date_range(years: int = None) -> tuple:
     if years is None:
         years = config.data_collection.default_years
     
-    end_date = datetime.now().strftime('%d/%m/%Y')
-    start_date = (datetime.now() - timedelta(days=365 * years)).strftime('%d/%m/%Y')
-    
-    return start_date, end_date
+    return _get_date_range_cached(years, date.today().toordinal())
 
 # Validação de configuração
 def validate_config() -> List[str]:
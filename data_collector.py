@@ -1,19 +1,85 @@
 # data_collector.py - Versão melhorada para coleta robusta de dados
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
+import numpy as np
 import json
 from datetime import datetime, timedelta
 import time
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from config import config, get_date_range
 
+# orjson é opcional: decodifica bytes direto, mais rápido que json.loads
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# pyarrow (já instalado com o Streamlit) converte as colunas em código nativo
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _parse_value(value) -> float:
+    """
+    Converte o campo 'valor' da API do BCB para float
+    
+    Args:
+        value: Valor em texto (ex: '4.52'), vazio ou None
+    
+    Returns:
+        float correspondente ou NaN se não for numérico
+    """
+    if value is None or value == '':
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+def _records_to_frame(dates: List[str], values: List) -> pd.DataFrame:
+    """
+    Monta o DataFrame (date, value) a partir das colunas em texto da API
+    
+    Usa pyarrow quando disponível; se ele não estiver instalado ou algum
+    valor não puder ser convertido, recorre ao caminho pandas/NumPy.
+    
+    Args:
+        dates: Datas no formato 'DD/MM/AAAA'
+        values: Valores em texto (podem ser vazios ou None)
+    
+    Returns:
+        DataFrame com 'date' datetime64[ns] e 'value' float64
+    """
+    if pa is not None:
+        try:
+            date_arr = pc.strptime(pa.array(dates, type=pa.string()), format='%d/%m/%Y', unit='ms')
+            value_arr = pa.array(values, type=pa.string())
+            value_arr = pc.if_else(pc.equal(value_arr, ''), pa.scalar(None, pa.string()), value_arr)
+            table = pa.table({'date': date_arr, 'value': pc.cast(value_arr, pa.float64())})
+            
+            df = table.to_pandas(self_destruct=True)
+            df['date'] = df['date'].astype('datetime64[ns]')
+            return df
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+    
+    return pd.DataFrame({
+        'date': pd.to_datetime(dates, format='%d/%m/%Y', cache=True, exact=True),
+        'value': np.fromiter(map(_parse_value, values), dtype=np.float64, count=len(values))
+    })
+
 class BCBDataCollector:
     """
     Coletor de dados robusto do Banco Central do Brasil
@@ -30,10 +96,41 @@ class BCBDataCollector:
     def __init__(self):
         self.base_url = config.data_collection.bcb_base_url
         self.indicators = config.data_collection.indicators
+        self._indicator_keys = frozenset(self.indicators)  # Conjunto fixo para validação
         self.max_retries = config.data_collection.max_retries
         self.timeout = config.data_collection.request_timeout
         self.delay = config.data_collection.delay_between_requests
         
+        # URLs base por indicador montadas uma única vez
+        self._base_urls = {
+            indicator: f"{self.base_url}.{meta['series_id']}/dados?formato=json"
+            for indicator, meta in self.indicators.items()
+        }
+        self._status_url = f"{self.base_url}.433/dados?formato=json&dataInicial=01/01/2024&dataFinal=01/01/2024"
+        # Timeouts curtos (conexão, leitura) para a verificação de status não
+        # travar a renderização da página quando a API estiver lenta
+        self._status_timeout = (2, 5)
+        
+        # Funções de coleta especializadas por indicador (URL já resolvida)
+        self._fetchers = {
+            indicator: self._make_fetcher(indicator)
+            for indicator in self.indicators
+        }
+        
+        # Vocabulário fixo de indicadores: DataFrames de indicadores diferentes
+        # mantêm o dtype categórico ao serem concatenados
+        self._indicator_dtype = pd.CategoricalDtype(list(self.indicators))
+        
+        # Sessão HTTP com pool de conexões reaproveitadas entre requisições
+        # (o retry fica a cargo de _make_request, preservando o logging)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=Retry(total=0))
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip'
+        })
+        
         # Estatísticas de coleta
         self.stats = {
             'total_requests': 0,
@@ -42,6 +139,23 @@ class BCBDataCollector:
             'total_records': 0
         }
     
+    def _make_fetcher(self, indicator: str):
+        """
+        Cria a função de coleta de um indicador, com o prefixo da URL fixado
+        
+        Args:
+            indicator: Nome do indicador
+        
+        Returns:
+            Função fetch(start_date, end_date) que retorna os dados JSON ou None
+        """
+        url_prefix = self._base_urls[indicator] + "&dataInicial="
+        
+        def fetch(start_date: str, end_date: str) -> Optional[List[Dict]]:
+            return self._make_request(f"{url_prefix}{start_date}&dataFinal={end_date}")
+        
+        return fetch
+    
     def _make_request(self, url: str, retries: int = None) -> Optional[List[Dict]]:
         """
         Faz requisição HTTP com retry automático
@@ -60,31 +174,30 @@ class BCBDataCollector:
         
         for attempt in range(retries + 1):
             try:
-                logger.debug(f"Tentativa {attempt + 1} para URL: {url}")
+                logger.debug("Tentativa %d para URL: %s", attempt + 1, url)
                 
-                response = requests.get(url, timeout=self.timeout)
+                response = self.session.get(url, timeout=self.timeout)
                 response.raise_for_status()
                 
-                data = response.json()
+                # Corpo vazio não é JSON válido: tratado como resposta vazia
+                data = _json_loads(response.content) if response.content else None
                 
                 if data:
                     self.stats['successful_requests'] += 1
                     return data
                 else:
-                    logger.warning(f"Resposta vazia para URL: {url}")
+                    logger.warning("Resposta vazia para URL: %s", url)
                     
-            except requests.exceptions.RequestException as e:
-                logger.warning(f"Erro na tentativa {attempt + 1}: {e}")
+            except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+                # Corpo não-JSON (ex: página HTML de erro/manutenção) é tratado
+                # como falha transitória, com o mesmo retry da requisição
+                # (orjson.JSONDecodeError é subclasse de json.JSONDecodeError)
+                logger.warning("Erro na tentativa %d: %s", attempt + 1, e)
                 if attempt < retries:
                     time.sleep(self.delay * (attempt + 1))  # Backoff exponencial
                 else:
-                    logger.error(f"Falha após {retries + 1} tentativas para URL: {url}")
+                    logger.error("Falha após %d tentativas para URL: %s", retries + 1, url)
                     self.stats['failed_requests'] += 1
-            
-            except json.JSONDecodeError as e:
-                logger.error(f"Erro ao decodificar JSON: {e}")
-                self.stats['failed_requests'] += 1
-                break
         
         return None
     
@@ -99,31 +212,31 @@ class BCBDataCollector:
         Returns:
             True se dados são válidos
         """
+        # Verificações em ordem de custo: metadados primeiro e a única
+        # varredura dos valores por último, com short-circuit
+        # Cada falha mantém seu nível de log: dados vazios são aviso, estrutura
+        # inválida (colunas/datas) é erro
         if df is None or df.empty:
-            logger.warning(f"DataFrame vazio para {indicator}")
+            level, problem = logging.WARNING, "DataFrame vazio"
+        elif not {'date', 'value'}.issubset(df.columns):
+            missing_columns = [col for col in ('date', 'value') if col not in df.columns]
+            level, problem = logging.ERROR, f"colunas obrigatórias ausentes {missing_columns}"
+        elif not pd.api.types.is_datetime64_any_dtype(df['date']):
+            # get_data já converte a coluna; não é feito novo parse aqui
+            level, problem = logging.ERROR, f"coluna de datas não convertida ({df['date'].dtype})"
+        elif not df['value'].notna().any():
+            level, problem = logging.WARNING, "nenhum valor válido encontrado"
+        else:
+            level = problem = None
+        
+        if problem is not None:
+            logger.log(level, "Dados inválidos para %s: %s", indicator, problem)
             return False
         
-        required_columns = ['date', 'value']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        
-        if missing_columns:
-            logger.error(f"Colunas obrigatórias ausentes para {indicator}: {missing_columns}")
-            return False
-        
-        # Verificar se há valores válidos
-        valid_values = df['value'].notna().sum()
-        if valid_values == 0:
-            logger.warning(f"Nenhum valor válido encontrado para {indicator}")
-            return False
-        
-        # Verificar formato de datas
-        try:
-            pd.to_datetime(df['date'])
-        except Exception as e:
-            logger.error(f"Erro no formato de datas para {indicator}: {e}")
-            return False
-        
-        logger.info(f"Dados válidos para {indicator}: {len(df)} registros, {valid_values} valores válidos")
+        # Contagem só é feita se a mensagem for de fato emitida
+        if logger.isEnabledFor(logging.INFO):
+            valid_values = df['value'].notna().sum()
+            logger.info("Dados válidos para %s: %d registros, %s valores válidos", indicator, len(df), valid_values)
         return True
     
     def get_data(self, indicator: str, start_date: str = None, end_date: str = None) -> Optional[pd.DataFrame]:
@@ -138,63 +251,64 @@ class BCBDataCollector:
         Returns:
             DataFrame com os dados do indicador ou None
         """
-        if indicator not in self.indicators:
-            logger.error(f"Indicador '{indicator}' não reconhecido")
+        if indicator not in self._indicator_keys:
+            logger.error("Indicador '%s' não reconhecido", indicator)
             return None
         
         # Usar configuração padrão se datas não fornecidas
         if start_date is None or end_date is None:
             start_date, end_date = get_date_range()
         
-        # Construir URL
         serie_id = self.indicators[indicator]['series_id']
-        url = f"{self.base_url}.{serie_id}/dados?formato=json"
-        url += f"&dataInicial={start_date}&dataFinal={end_date}"
-        
-        logger.info(f"Coletando dados para {indicator} (série {serie_id}) de {start_date} a {end_date}")
+        logger.info("Coletando dados para %s (série %s) de %s a %s", indicator, serie_id, start_date, end_date)
         
         # Fazer requisição
-        data = self._make_request(url)
+        data = self._fetchers[indicator](start_date, end_date)
         
         if not data:
-            logger.error(f"Falha ao obter dados para {indicator}")
+            logger.error("Falha ao obter dados para %s", indicator)
             return None
         
         try:
-            # Converter para DataFrame
-            df = pd.DataFrame(data)
-            
-            # Renomear colunas para padrão
-            df.rename(columns={
-                'data': 'date',
-                'valor': 'value'
-            }, inplace=True)
+            # Montar as colunas já tipadas direto da resposta JSON, em uma
+            # única passada, liberando os registros antes de criar o DataFrame
+            dates, values = [], []
+            for record in data:
+                dates.append(record['data'])
+                values.append(record['valor'])
+            del data
             
-            # Converter tipos de dados
-            df['date'] = pd.to_datetime(df['date'], format='%d/%m/%Y')
-            df['value'] = pd.to_numeric(df['value'], errors='coerce')
+            df = _records_to_frame(dates, values)
             
             # Adicionar metadados
-            df['indicator'] = indicator
-            df['series_id'] = serie_id
-            df['collected_at'] = datetime.now()
+            df = df.assign(
+                indicator=pd.Categorical.from_codes(
+                    np.full(len(df), self._indicator_dtype.categories.get_loc(indicator)),
+                    dtype=self._indicator_dtype
+                ),
+                series_id=serie_id,
+                collected_at=np.datetime64(datetime.now(), 'ns')
+            )
             
-            # Ordenar por data
-            df = df.sort_values('date').reset_index(drop=True)
+            # Ordenar por data (a API normalmente já devolve em ordem crescente)
+            dates = df['date'].to_numpy()
+            if not (dates[:-1] <= dates[1:]).all():
+                df = df.sort_values('date', kind='mergesort', ignore_index=True)
             
             # Validar dados
             if self._validate_data(df, indicator):
                 self.stats['total_records'] += len(df)
-                logger.info(f"Coletados {len(df)} registros para {indicator}")
+                logger.info("Coletados %d registros para %s", len(df), indicator)
                 return df
             else:
                 return None
                 
         except Exception as e:
-            logger.error(f"Erro ao processar dados para {indicator}: {e}")
+            logger.error("Erro ao processar dados para %s: %s", indicator, e)
             return None
     
-    def collect_indicator_batch(self, indicators: List[str], start_date: str = None, end_date: str = None) -> Dict[str, pd.DataFrame]:
+    def collect_indicator_batch(self, indicators: List[str], start_date: str = None, end_date: str = None,
+                                on_progress: Callable[[int, int], None] = None) -> Dict[str, pd.DataFrame]:
         """
         Coleta dados para múltiplos indicadores em paralelo
         
@@ -202,6 +316,8 @@ class BCBDataCollector:
             indicators: Lista de indicadores
             start_date: Data inicial
             end_date: Data final
+            on_progress: Callback opcional chamado como (concluídos, total) a cada
+                indicador finalizado, na thread que chamou o método
         
         Returns:
             Dict com DataFrames para cada indicador
@@ -212,36 +328,41 @@ class BCBDataCollector:
             try:
                 return indicator, self.get_data(indicator, start_date, end_date)
             except Exception as e:
-                logger.error(f"Erro ao coletar {indicator}: {e}")
+                logger.error("Erro ao coletar %s: %s", indicator, e)
                 return indicator, None
         
-        # Usar ThreadPoolExecutor para coleta paralela
-        with ThreadPoolExecutor(max_workers=3) as executor:  # Limitado para não sobrecarregar a API
+        # Requisições são puro I/O: todas as séries são disparadas em paralelo,
+        # limitadas ao tamanho do pool de conexões da sessão
+        max_workers = max(1, min(len(indicators), 8))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
             future_to_indicator = {
                 executor.submit(collect_single, indicator): indicator 
                 for indicator in indicators
             }
             
-            for future in as_completed(future_to_indicator):
+            total = len(future_to_indicator)
+            for done, future in enumerate(as_completed(future_to_indicator), 1):
                 indicator, df = future.result()
                 if df is not None:
                     results[indicator] = df
-                    logger.info(f"✓ Concluído: {indicator}")
+                    logger.info("✓ Concluído: %s", indicator)
                 else:
-                    logger.warning(f"✗ Falhou: {indicator}")
+                    logger.warning("✗ Falhou: %s", indicator)
                 
-                # Pequeno delay entre conclusões
-                time.sleep(self.delay)
+                if on_progress is not None:
+                    on_progress(done, total)
         
         return results
     
-    def collect_all_data(self, last_n_years: int = None, indicators: List[str] = None) -> Dict[str, pd.DataFrame]:
+    def collect_all_data(self, last_n_years: int = None, indicators: List[str] = None,
+                         on_progress: Callable[[int, int], None] = None) -> Dict[str, pd.DataFrame]:
         """
         Coleta dados de todos os indicadores ou lista específica
         
         Args:
             last_n_years: Número de anos retroativos (padrão: configuração)
             indicators: Lista específica de indicadores (opcional)
+            on_progress: Callback opcional (concluídos, total) por indicador coletado
         
         Returns:
             Dict com DataFrames para cada indicador
@@ -257,8 +378,8 @@ class BCBDataCollector:
         # Calcular datas
         start_date, end_date = get_date_range(last_n_years)
         
-        logger.info(f"Iniciando coleta de {len(indicators)} indicadores para {last_n_years} anos")
-        logger.info(f"Período: {start_date} a {end_date}")
+        logger.info("Iniciando coleta de %d indicadores para %s anos", len(indicators), last_n_years)
+        logger.info("Período: %s a %s", start_date, end_date)
         
         # Resetar estatísticas
         self.stats = {
@@ -271,16 +392,16 @@ class BCBDataCollector:
         start_time = time.time()
         
         # Coletar dados
-        results = self.collect_indicator_batch(indicators, start_date, end_date)
+        results = self.collect_indicator_batch(indicators, start_date, end_date, on_progress)
         
         # Estatísticas finais
         duration = time.time() - start_time
         success_rate = (self.stats['successful_requests'] / max(self.stats['total_requests'], 1)) * 100
         
-        logger.info(f"Coleta concluída em {duration:.2f}s")
-        logger.info(f"Indicadores coletados: {len(results)}/{len(indicators)}")
-        logger.info(f"Taxa de sucesso: {success_rate:.1f}%")
-        logger.info(f"Total de registros: {self.stats['total_records']}")
+        logger.info("Coleta concluída em %.2fs", duration)
+        logger.info("Indicadores coletados: %d/%d", len(results), len(indicators))
+        logger.info("Taxa de sucesso: %.1f%%", success_rate)
+        logger.info("Total de registros: %s", self.stats['total_records'])
         
         return results
     
@@ -300,15 +421,13 @@ class BCBDataCollector:
         Returns:
             True se API está OK
         """
-        test_url = f"{self.base_url}.433/dados?formato=json&dataInicial=01/01/2024&dataFinal=01/01/2024"
-        
         try:
-            response = requests.get(test_url, timeout=10)
+            response = self.session.get(self._status_url, timeout=self._status_timeout)
             response.raise_for_status()
             logger.info("API do BCB está respondendo normalmente")
             return True
         except Exception as e:
-            logger.error(f"API do BCB não está respondendo: {e}")
+            logger.error("API do BCB não está respondendo: %s", e)
             return False
     
     def get_available_periods(self, indicator: str) -> Optional[Tuple[datetime, datetime]]:
@@ -321,22 +440,19 @@ class BCBDataCollector:
         Returns:
             Tuple (data_inicial, data_final) ou None
         """
-        if indicator not in self.indicators:
+        if indicator not in self._indicator_keys:
             return None
         
         # Fazer requisição sem filtro de data para ver período completo
-        serie_id = self.indicators[indicator]['series_id']
-        url = f"{self.base_url}.{serie_id}/dados?formato=json"
-        
-        data = self._make_request(url)
+        data = self._make_request(self._base_urls[indicator])
         
         if data:
             try:
                 df = pd.DataFrame(data)
-                df['data'] = pd.to_datetime(df['data'], format='%d/%m/%Y')
+                df['data'] = pd.to_datetime(df['data'], format='%d/%m/%Y', cache=True, exact=True)
                 return df['data'].min(), df['data'].max()
             except Exception as e:
-                logger.error(f"Erro ao obter período para {indicator}: {e}")
+                logger.error("Erro ao obter período para %s: %s", indicator, e)
         
         return None
 
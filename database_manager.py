@@ -1,24 +1,64 @@
 # Arquivo: database_manager.py
 import sqlite3
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 import os
 from datetime import datetime
 
+# Data de fechamento de cada período em SQLite (mesmos rótulos do resample
+# 'M'/'Q'/'Y' do pandas), usada para agregar no próprio banco
+_PERIOD_END_SQL = {
+    'monthly': "date(date, 'start of month', '+1 month', '-1 day')",
+    'quarterly': (
+        "date(date, 'start of month', "
+        "'-' || ((CAST(strftime('%m', date) AS INTEGER) - 1) % 3) || ' months', "
+        "'+3 months', '-1 day')"
+    ),
+    'yearly': "date(date, 'start of year', '+1 year', '-1 day')"
+}
+
+# Ajustes por conexão (não persistem no arquivo): fsync só nos checkpoints
+# do WAL, temporários em memória, leitura por mmap e cache de páginas de 64 MB
+_CONNECTION_PRAGMAS = (
+    'PRAGMA foreign_keys=ON',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA cache_size=-65536'
+)
+
+def _apply_pragmas(dbapi_conn, connection_record=None):
+    """Aplica os PRAGMAs de conexão (também usado como listener do SQLAlchemy)"""
+    cursor = dbapi_conn.cursor()
+    for pragma in _CONNECTION_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
 class DatabaseManager:
+    # Agregações que load_data sabe calcular no banco
+    SQL_AGGREGATIONS = frozenset(_PERIOD_END_SQL)
+    
     def __init__(self, db_name='economic_data.db'):
         """Inicializa o gerenciador de banco de dados SQLite"""
         self.db_path = db_name
         self.engine = create_engine(f'sqlite:///{db_name}')
+        event.listen(self.engine, 'connect', _apply_pragmas)
         
-        # Criar o banco de dados se não existir
+        # Criar o banco de dados se não existir (page_size precisa ser
+        # definido antes da criação das tabelas)
         if not os.path.exists(db_name):
-            self._create_tables()
             self._optimize_sqlite()
+            self._create_tables()
+    
+    def _connect(self, **kwargs):
+        """Abre uma conexão sqlite3 já com os PRAGMAs de desempenho"""
+        conn = sqlite3.connect(self.db_path, **kwargs)
+        _apply_pragmas(conn)
+        return conn
     
     def _create_tables(self):
         """Cria as tabelas necessárias no banco de dados"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         # Indicadores do BCB
@@ -53,76 +93,106 @@ class DatabaseManager:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        # Ativar modo WAL (Write-Ahead Logging) para melhorar concorrência
-        cursor.execute('PRAGMA journal_mode=WAL')
-        
-        # Garantir integridade dos dados
-        cursor.execute('PRAGMA foreign_keys=ON')
+        # Tamanho de página só tem efeito em banco ainda vazio
+        cursor.execute('PRAGMA page_size=4096')
         
-        # Otimizar operações para velocidade
-        cursor.execute('PRAGMA synchronous=NORMAL')
+        # Ativar modo WAL (Write-Ahead Logging) para melhorar concorrência;
+        # fica gravado no arquivo e vale para todas as conexões seguintes
+        cursor.execute('PRAGMA journal_mode=WAL')
         
         conn.commit()
         conn.close()
     
     def save_data(self, table_name, df):
         """Salva um DataFrame no banco de dados"""
+        return self.save_many({table_name: df})[table_name]
+    
+    def save_many(self, data_dict, on_progress=None):
+        """
+        Salva vários DataFrames em uma única transação (upsert por data)
+        
+        Args:
+            data_dict: Dict {tabela: DataFrame com colunas date e value}
+            on_progress: Callback opcional (concluídas, total) após cada tabela
+        
+        Returns:
+            Dict {tabela: True/False} indicando o sucesso de cada gravação
+        """
+        results = {}
+        total = len(data_dict)
+        
+        # Autocommit do driver desligado: BEGIN/COMMIT explícitos, com um
+        # SAVEPOINT por tabela para que uma falha não descarte as demais
+        conn = self._connect(isolation_level=None)
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("BEGIN")
+            
+            for i, (table_name, df) in enumerate(data_dict.items(), 1):
+                results[table_name] = self._upsert_table(cursor, table_name, df)
+                
+                if on_progress is not None:
+                    on_progress(i, total)
+            
+            cursor.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                cursor.execute("ROLLBACK")
+            print(f"Erro ao salvar dados: {e}")
+            results = {table_name: False for table_name in data_dict}
+        finally:
+            conn.close()
+        
+        return results
+    
+    def _upsert_table(self, cursor, table_name, df):
+        """Grava um DataFrame em sua tabela dentro da transação corrente"""
         if df is None or df.empty:
             print(f"Nenhum dado para salvar na tabela {table_name}")
             return False
         
         # Selecionar apenas as colunas necessárias
-        if 'date' in df.columns and 'value' in df.columns:
-            df_copy = df[['date', 'value']].copy()
-            
-            # Verificar por valores duplicados na data (para atualização)
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            try:
-                # Para cada linha, inserir ou atualizar (upsert)
-                for _, row in df_copy.iterrows():
-                    date_str = row['date'].strftime('%Y-%m-%d') if isinstance(row['date'], datetime) else row['date']
-                    value = row['value']
-                    
-                    # Verificar se já existe um registro para esta data
-                    cursor.execute(f"SELECT id FROM {table_name} WHERE date = ?", (date_str,))
-                    existing = cursor.fetchone()
-                    
-                    if existing:
-                        # Atualizar registro existente
-                        cursor.execute(f"UPDATE {table_name} SET value = ?, created_at = CURRENT_TIMESTAMP WHERE date = ?", 
-                                      (value, date_str))
-                    else:
-                        # Inserir novo registro
-                        cursor.execute(f"INSERT INTO {table_name} (date, value) VALUES (?, ?)", 
-                                      (date_str, value))
-                
-                conn.commit()
-                print(f"Dados salvos com sucesso na tabela {table_name}")
-                return True
-            
-            except Exception as e:
-                conn.rollback()
-                print(f"Erro ao salvar dados na tabela {table_name}: {e}")
-                return False
-            finally:
-                conn.close()
-        else:
+        if not ('date' in df.columns and 'value' in df.columns):
             print(f"Colunas necessárias não encontradas no DataFrame para a tabela {table_name}")
             return False
+        
+        # Última ocorrência de cada data prevalece, como no upsert linha a linha
+        df_copy = df[['date', 'value']].drop_duplicates('date', keep='last')
+        dates = df_copy['date']
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            dates = dates.dt.strftime('%Y-%m-%d').tolist()
+        else:
+            dates = [d.strftime('%Y-%m-%d') if isinstance(d, datetime) else d for d in dates]
+        values = df_copy['value'].astype(float).tolist()
+        
+        cursor.execute("SAVEPOINT upsert_table")
+        try:
+            # Atualizar datas já existentes e inserir apenas as novas
+            cursor.executemany(
+                f"UPDATE {table_name} SET value = ?, created_at = CURRENT_TIMESTAMP WHERE date = ?",
+                zip(values, dates)
+            )
+            cursor.executemany(
+                f"INSERT INTO {table_name} (date, value) "
+                f"SELECT ?, ? WHERE NOT EXISTS (SELECT 1 FROM {table_name} WHERE date = ?)",
+                zip(dates, values, dates)
+            )
+            cursor.execute("RELEASE upsert_table")
+        except Exception as e:
+            cursor.execute("ROLLBACK TO upsert_table")
+            cursor.execute("RELEASE upsert_table")
+            print(f"Erro ao salvar dados na tabela {table_name}: {e}")
+            return False
+        
+        print(f"Dados salvos com sucesso na tabela {table_name}")
+        return True
     
     def save_all_data(self, data_dict):
         """Salva todos os DataFrames do dicionário em suas respectivas tabelas"""
-        results = {}
-        
-        for table_name, df in data_dict.items():
-            success = self.save_data(table_name, df)
-            results[table_name] = success
-        
-        return results
+        return self.save_many(data_dict)
     
-    def load_data(self, table_name, start_date=None, end_date=None):
+    def load_data(self, table_name, start_date=None, end_date=None, deduplicate=False, aggregation=None):
         """
         Carrega dados de uma tabela do banco de dados, com opção de filtrar por período
         
@@ -130,37 +200,194 @@ class DatabaseManager:
             table_name: Nome da tabela
             start_date: Data inicial (opcional)
             end_date: Data final (opcional)
+            deduplicate: Se True, mantém só o registro mais recente de cada data
+            aggregation: 'monthly', 'quarterly' ou 'yearly' para trazer a média
+                de cada período (colunas date e value), calculada no SQLite
             
         Returns:
-            DataFrame com os dados
+            DataFrame com os dados, ordenado por data
         """
         try:
-            query = f"SELECT * FROM {table_name}"
+            if deduplicate:
+                # Último registro inserido por data, escolhido pelo próprio SQLite
+                query = (
+                    f"SELECT * FROM {table_name} WHERE rowid IN ("
+                    f"SELECT MAX(rowid) FROM {table_name}"
+                    f"{self._date_filter(start_date, end_date)} GROUP BY date)"
+                )
+            else:
+                query = f"SELECT * FROM {table_name}"
+                
+                # Adicionar filtros de data se fornecidos
+                query += self._date_filter(start_date, end_date)
             
-            # Adicionar filtros de data se fornecidos
-            if start_date and end_date:
-                query += f" WHERE date BETWEEN '{start_date}' AND '{end_date}'"
-            elif start_date:
-                query += f" WHERE date >= '{start_date}'"
-            elif end_date:
-                query += f" WHERE date <= '{end_date}'"
+            if aggregation:
+                # Média por período já no banco: só as linhas agregadas
+                # chegam ao pandas
+                query = (
+                    f"SELECT {_PERIOD_END_SQL[aggregation]} AS date, AVG(value) AS value "
+                    f"FROM ({query}) GROUP BY 1"
+                )
                 
             query += " ORDER BY date"
             
             df = pd.read_sql(query, self.engine)
             
-            # Converter a coluna de data para datetime
+            # Converter a coluna de data para datetime (texto ISO gravado por
+            # save_data: parser ISO direto, sem inferir o formato)
             if 'date' in df.columns:
-                df['date'] = pd.to_datetime(df['date'])
+                df['date'] = pd.to_datetime(df['date'], format='ISO8601')
                 
             return df
         except Exception as e:
             print(f"Erro ao carregar dados da tabela {table_name}: {e}")
             return None
     
+    def load_data_multi(self, table_names, start_date=None, end_date=None, aggregation=None):
+        """
+        Carrega várias tabelas com uma única consulta (UNION ALL)
+        
+        Args:
+            table_names: Lista de tabelas (indicadores)
+            start_date: Data inicial (opcional)
+            end_date: Data final (opcional)
+            aggregation: 'monthly', 'quarterly' ou 'yearly' para trazer a média
+                de cada período, como em load_data
+            
+        Returns:
+            Dict {tabela: DataFrame com colunas date e value}; tabelas
+            inexistentes ou vazias ficam de fora
+        """
+        try:
+            with self.engine.connect() as conn:
+                existing = {
+                    row[0] for row in conn.exec_driver_sql(
+                        "SELECT name FROM sqlite_master WHERE type='table'"
+                    )
+                }
+                tables = [table for table in table_names if table in existing]
+                if not tables:
+                    return {}
+                
+                date_filter = self._date_filter(start_date, end_date)
+                if aggregation:
+                    select = f"{_PERIOD_END_SQL[aggregation]} AS date, AVG(value) AS value"
+                    group_by = " GROUP BY 2"
+                else:
+                    select = "date, value"
+                    group_by = ""
+                query = " UNION ALL ".join(
+                    f"SELECT '{table}' AS indicator, {select} FROM {table}{date_filter}{group_by}"
+                    for table in tables
+                )
+                query += " ORDER BY indicator, date"
+                
+                df = pd.read_sql(query, conn)
+            
+            df['date'] = pd.to_datetime(df['date'], format='ISO8601')
+            
+            return {
+                table: group.drop(columns='indicator').reset_index(drop=True)
+                for table, group in df.groupby('indicator', sort=False)
+            }
+        except Exception as e:
+            print(f"Erro ao carregar dados das tabelas {table_names}: {e}")
+            return {}
+    
+    def count_records(self, table_names):
+        """
+        Conta os registros de várias tabelas com uma única consulta
+        
+        Args:
+            table_names: Lista de tabelas (indicadores)
+            
+        Returns:
+            Dict {tabela: quantidade de registros}; tabelas inexistentes
+            ficam de fora
+        """
+        try:
+            with self.engine.connect() as conn:
+                existing = {
+                    row[0] for row in conn.exec_driver_sql(
+                        "SELECT name FROM sqlite_master WHERE type='table'"
+                    )
+                }
+                tables = [table for table in table_names if table in existing]
+                if not tables:
+                    return {}
+                
+                query = " UNION ALL ".join(
+                    f"SELECT '{table}', COUNT(*) FROM {table}" for table in tables
+                )
+                return {table: count for table, count in conn.exec_driver_sql(query)}
+        except Exception as e:
+            print(f"Erro ao contar registros das tabelas {table_names}: {e}")
+            return {}
+    
+    def has_data(self, table_name):
+        """
+        Verifica se uma tabela existe e tem ao menos um registro
+        
+        Lê no máximo uma linha (LIMIT 1), sem montar DataFrame.
+        
+        Args:
+            table_name: Nome da tabela (indicador)
+            
+        Returns:
+            True se houver dados, False caso contrário
+        """
+        try:
+            with self.engine.connect() as conn:
+                exists = conn.exec_driver_sql(
+                    "SELECT 1 FROM sqlite_master WHERE type='table' AND name = ?", (table_name,)
+                ).fetchone()
+                if not exists:
+                    return False
+                return conn.exec_driver_sql(f"SELECT 1 FROM {table_name} LIMIT 1").fetchone() is not None
+        except Exception as e:
+            print(f"Erro ao verificar dados da tabela {table_name}: {e}")
+            return False
+    
+    def list_nonempty_indicators(self):
+        """
+        Lista as tabelas (indicadores) que têm ao menos um registro
+        
+        Usa uma única consulta com EXISTS por tabela, sem carregar os dados.
+            
+        Returns:
+            Set com os nomes das tabelas não vazias
+        """
+        try:
+            with self.engine.connect() as conn:
+                tables = [
+                    row[0] for row in conn.exec_driver_sql(
+                        "SELECT name FROM sqlite_master WHERE type='table' AND name != 'sqlite_sequence'"
+                    )
+                ]
+                if not tables:
+                    return set()
+                
+                query = " UNION ALL ".join(
+                    f"SELECT '{table}' WHERE EXISTS (SELECT 1 FROM {table})" for table in tables
+                )
+                return {row[0] for row in conn.exec_driver_sql(query)}
+        except Exception as e:
+            print(f"Erro ao listar indicadores com dados: {e}")
+            return set()
+    
+    def _date_filter(self, start_date=None, end_date=None):
+        """Monta a cláusula WHERE de período usada pelas consultas de carga"""
+        if start_date and end_date:
+            return f" WHERE date BETWEEN '{start_date}' AND '{end_date}'"
+        elif start_date:
+            return f" WHERE date >= '{start_date}'"
+        elif end_date:
+            return f" WHERE date <= '{end_date}'"
+        return ""
+    
     def get_stats(self):
         """Obtém estatísticas sobre o banco de dados"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         stats = {}
@@ -15,6 +15,10 @@ def verificar_disponibilidade_dados():
     """Verifica disponibilidade de dados para cada indicador"""
     base_url = "https://api.bcb.gov.br/dados/serie/bcdata.sgs"
     
+    # Sessão única para reaproveitar a conexão com a API entre as consultas
+    session = requests.Session()
+    session.headers.update({'Accept': 'application/json', 'Accept-Encoding': 'gzip'})
+    
     # Definir período de 10 anos
     end_date = datetime.now().strftime('%d/%m/%Y')
     start_date = (datetime.now() - timedelta(days=365 * 10)).strftime('%d/%m/%Y')
@@ -32,13 +36,13 @@ def verificar_disponibilidade_dados():
         try:
             # Fazer requisição SEM filtro de data primeiro
             url_total = f"{base_url}.{serie_id}/dados?formato=json"
-            response_total = requests.get(url_total, timeout=30)
+            response_total = session.get(url_total, timeout=30)
             response_total.raise_for_status()
             data_total = response_total.json()
             
             if data_total:
                 df_total = pd.DataFrame(data_total)
-                df_total['data'] = pd.to_datetime(df_total['data'], format='%d/%m/%Y')
+                df_total['data'] = pd.to_datetime(df_total['data'], format='%d/%m/%Y', cache=True, exact=True)
                 
                 primeiro_registro = df_total['data'].min()
                 ultimo_registro = df_total['data'].max()
@@ -49,36 +53,26 @@ def verificar_disponibilidade_dados():
                 print(f"   📅 Período completo: {primeiro_registro.strftime('%d/%m/%Y')} a {ultimo_registro.strftime('%d/%m/%Y')}")
                 print(f"   ⏱️  Anos de dados disponíveis: {anos_disponivel:.1f}")
                 
-                # Fazer requisição COM filtro de 10 anos
-                url_filtered = f"{base_url}.{serie_id}/dados?formato=json&dataInicial={start_date}&dataFinal={end_date}"
-                response_filtered = requests.get(url_filtered, timeout=30)
+                # Contagens dos últimos 10 e 5 anos derivadas da série completa,
+                # sem novas requisições à API
+                cutoff_10 = pd.Timestamp(datetime.now() - timedelta(days=365 * 10)).normalize()
+                cutoff_5 = pd.Timestamp(datetime.now() - timedelta(days=365 * 5)).normalize()
+                registros_10_anos = int((df_total['data'] >= cutoff_10).sum())
+                registros_5_anos = int((df_total['data'] >= cutoff_5).sum())
                 
-                if response_filtered.status_code == 200:
-                    data_filtered = response_filtered.json()
-                    if data_filtered:
-                        registros_10_anos = len(data_filtered)
-                        print(f"   🎯 Registros últimos 10 anos: {registros_10_anos}")
-                        
-                        # Verificar se conseguimos os 10 anos completos
-                        if anos_disponivel >= 10:
-                            print(f"   ✅ DADOS COMPLETOS: 10 anos disponíveis")
-                        else:
-                            print(f"   ⚠️  DADOS LIMITADOS: Apenas {anos_disponivel:.1f} anos disponíveis")
+                if registros_10_anos:
+                    print(f"   🎯 Registros últimos 10 anos: {registros_10_anos}")
+                    
+                    # Verificar se conseguimos os 10 anos completos
+                    if anos_disponivel >= 10:
+                        print(f"   ✅ DADOS COMPLETOS: 10 anos disponíveis")
                     else:
-                        print(f"   ❌ Nenhum dado retornado para os últimos 10 anos")
+                        print(f"   ⚠️  DADOS LIMITADOS: Apenas {anos_disponivel:.1f} anos disponíveis")
                 else:
-                    print(f"   ❌ Erro na requisição filtrada: {response_filtered.status_code}")
-                    
-                # Teste com 5 anos para comparação
-                start_5y = (datetime.now() - timedelta(days=365 * 5)).strftime('%d/%m/%Y')
-                url_5y = f"{base_url}.{serie_id}/dados?formato=json&dataInicial={start_5y}&dataFinal={end_date}"
-                response_5y = requests.get(url_5y, timeout=30)
+                    print(f"   ❌ Nenhum dado retornado para os últimos 10 anos")
                 
-                if response_5y.status_code == 200:
-                    data_5y = response_5y.json()
-                    if data_5y:
-                        registros_5_anos = len(data_5y)
-                        print(f"   📊 Registros últimos 5 anos: {registros_5_anos}")
+                if registros_5_anos:
+                    print(f"   📊 Registros últimos 5 anos: {registros_5_anos}")
                         
             else:
                 print(f"   ❌ Nenhum dado disponível para esta série")
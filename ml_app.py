@@ -45,8 +45,7 @@ db_manager = DatabaseManager()
 available_indicators = {}
 
 for ind in indicator_names.keys():
-    data = db_manager.load_data(ind)
-    if data is not None and len(data) > 0:
+    if db_manager.has_data(ind):
         available_indicators[ind] = indicator_names[ind]
 
 # Seleção de indicador
@@ -1,15 +1,176 @@
 # Arquivo: ml_models.py - VERSÃO FINAL LIMPA
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.preprocessing import StandardScaler
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.metrics import r2_score
 import joblib
 import os
 import logging
+from collections import deque
+from functools import lru_cache
+
+try:
+    import bottleneck as bn
+except ImportError:  # Opcional: sem ele, usa o rolling do pandas
+    bn = None
 
 logger = logging.getLogger(__name__)
 
+# Linhas por bloco na inferência em lote (mantém os arrays de nós no cache)
+_PREDICT_CHUNK = 10_000
+# A partir de quantas linhas vale distribuir o predict do sklearn em threads
+_PARALLEL_MIN_ROWS = 1_000
+
+@lru_cache(maxsize=8)
+def _load_model_data(model_path, mtime):
+    """
+    Carrega um modelo salvo (mapeado em memória), reaproveitando a carga
+    enquanto o arquivo não mudar
+    
+    Args:
+        model_path: Caminho do arquivo .pkl
+        mtime: Data de modificação do arquivo (parte da chave do cache)
+    
+    Returns:
+        Dict salvo por train_model (model, scaler, feature_columns, ...),
+        acrescido de 'flat_forest', 'scaler_mean' e 'scaler_inv_scale'
+    """
+    # Arrays das árvores mapeados em memória: compartilhados entre processos
+    model_data = joblib.load(model_path, mmap_mode='r')
+    
+    # Floresta achatada para inferência vetorizada (None se não for árvore)
+    model_data['flat_forest'] = _flatten_forest(model_data['model'])
+    
+    # Parâmetros do StandardScaler prontos para (x - média) * inverso da escala
+    scaler = model_data['scaler']
+    model_data['scaler_mean'] = np.asarray(scaler.mean_, dtype=np.float64)
+    model_data['scaler_inv_scale'] = 1.0 / np.asarray(scaler.scale_, dtype=np.float64)
+    
+    # Inferência sem pool de processos por chamada: o paralelismo, quando
+    # houver, vem do backend de threads escolhido em _predict_rows
+    if hasattr(model_data['model'], 'n_jobs'):
+        model_data['model'].n_jobs = None
+    return model_data
+
+def _moving_mean(series, window):
+    """
+    Média móvel com janelas parciais no início (min_periods=1)
+    
+    Args:
+        series: Série de valores
+        window: Tamanho da janela
+    
+    Returns:
+        Array (bottleneck) ou Series (pandas) com as médias
+    """
+    if bn is not None:
+        return bn.move_mean(series.to_numpy(dtype=np.float64), window, min_count=1)
+    return series.rolling(window=window, min_periods=1).mean()
+
+def _add_months(base_date, steps):
+    """
+    Datas de 1 a `steps` meses após base_date, sem DateOffset por passo
+    
+    Args:
+        base_date: Data de referência (último dado conhecido)
+        steps: Quantidade de meses
+    
+    Returns:
+        DatetimeIndex equivalente a base_date + DateOffset(months=k), com o
+        dia limitado ao último dia de cada mês
+    """
+    base_date = pd.Timestamp(base_date)
+    month_starts = pd.date_range(base_date.to_period('M').to_timestamp(), periods=steps + 1, freq='MS')[1:]
+    days = np.minimum(base_date.day, month_starts.days_in_month.to_numpy()) - 1
+    return month_starts + pd.to_timedelta(days, unit='D') + (base_date - base_date.normalize())
+
+def _flatten_forest(model):
+    """
+    Achata as árvores de um ensemble do sklearn em arrays únicos de nós
+    
+    Args:
+        model: Modelo com estimators_ de árvores (ex: RandomForestRegressor)
+    
+    Returns:
+        Dict com arrays concatenados (filhos, feature, threshold, valor) e a
+        raiz de cada árvore, ou None se o modelo não for um ensemble de árvores
+    """
+    estimators = getattr(model, 'estimators_', None)
+    if not estimators or not all(hasattr(tree, 'tree_') for tree in estimators):
+        return None
+    
+    trees = [tree.tree_ for tree in estimators]
+    offsets = np.cumsum([0] + [tree.node_count for tree in trees[:-1]])
+    
+    def shift(children, offset):
+        # Folhas (-1) continuam como -1; demais índices ganham o deslocamento
+        return np.where(children == -1, -1, children + offset)
+    
+    return {
+        'roots': offsets.astype(np.intp),
+        'left': np.concatenate([shift(t.children_left, o) for t, o in zip(trees, offsets)]).astype(np.intp),
+        'right': np.concatenate([shift(t.children_right, o) for t, o in zip(trees, offsets)]).astype(np.intp),
+        'feature': np.concatenate([t.feature for t in trees]).astype(np.intp),
+        'threshold': np.concatenate([t.threshold for t in trees]),
+        'value': np.concatenate([t.value[:, 0, 0] for t in trees])
+    }
+
+def _forest_predict(flat, X):
+    """
+    Percorre todas as árvores ao mesmo tempo, um nível por iteração
+    
+    Args:
+        flat: Arrays gerados por _flatten_forest
+        X: Array (n_amostras, n_features) já escalonado
+    
+    Returns:
+        Array com a média das folhas de todas as árvores para cada amostra
+    """
+    # O sklearn compara as features em float32 com thresholds em float64
+    X = np.asarray(X, dtype=np.float32).astype(np.float64)
+    rows = np.arange(X.shape[0])[:, None]
+    nodes = np.broadcast_to(flat['roots'], (X.shape[0], flat['roots'].size)).copy()
+    
+    while True:
+        left = flat['left'][nodes]
+        internal = left != -1
+        if not internal.any():
+            break
+        go_left = X[rows, flat['feature'][nodes]] <= flat['threshold'][nodes]
+        nodes = np.where(internal, np.where(go_left, left, flat['right'][nodes]), nodes)
+    
+    return flat['value'][nodes].mean(axis=1)
+
+def _predict_rows(model_data, X):
+    """
+    Prevê um bloco de linhas já escalonadas, em pedaços de _PREDICT_CHUNK
+    
+    Args:
+        model_data: Dict retornado por _load_model_data
+        X: Array (n_amostras, n_features) já escalonado
+    
+    Returns:
+        Array com uma previsão por linha
+    """
+    flat_forest = model_data.get('flat_forest')
+    model = model_data['model']
+    predictions = []
+    
+    for start in range(0, X.shape[0], _PREDICT_CHUNK):
+        chunk = X[start:start + _PREDICT_CHUNK]
+        if flat_forest is not None:
+            predictions.append(_forest_predict(flat_forest, chunk))
+        elif chunk.shape[0] >= _PARALLEL_MIN_ROWS:
+            # Travessia das árvores do sklearn libera o GIL: threads bastam
+            with joblib.parallel_backend('threading', n_jobs=os.cpu_count()):
+                predictions.append(model.predict(chunk))
+        else:
+            predictions.append(model.predict(chunk))
+    
+    return np.concatenate(predictions) if predictions else np.empty(0)
+
 class EconomicPredictor:
     def __init__(self):
         self.db_manager = None
@@ -36,25 +197,27 @@ class EconomicPredictor:
         """Prepara dados de forma simples"""
         try:
             db_manager = self._get_db_manager()
-            target_data = db_manager.load_data(target_indicator)
+            target_data = db_manager.load_data(target_indicator, deduplicate=True)
             
             if target_data is None or target_data.empty:
                 print(f"❌ Sem dados para {target_indicator}")
                 return None, None, None
             
-            # Limpar e ordenar
-            df = target_data[['date', 'value']].copy()
-            df = df.sort_values('date').reset_index(drop=True)
-            df = df.drop_duplicates(subset=['date'], keep='last')
+            # Já vem ordenado e sem datas repetidas do banco
+            df = target_data[['date', 'value']].reset_index(drop=True)
             
-            # Criar features essenciais
-            for i in range(1, window_size + 1):
-                df[f'lag_{i}'] = df['value'].shift(i)
+            # Criar features essenciais: todas as defasagens de uma vez a partir
+            # de uma visão em janela deslizante (linha r = valores r-1 ... r-window_size)
+            values = df['value'].to_numpy(dtype=np.float64)
+            padded = np.concatenate([np.full(window_size, np.nan), values])
+            lags = sliding_window_view(padded, window_size)[:-1, ::-1]
+            df[[f'lag_{i}' for i in range(1, window_size + 1)]] = lags
             
-            df['ma_3'] = df['value'].rolling(window=3, min_periods=1).mean()
-            df['ma_6'] = df['value'].rolling(window=6, min_periods=1).mean()
-            df['month'] = df['date'].dt.month
-            df['quarter'] = df['date'].dt.quarter
+            df['ma_3'] = _moving_mean(df['value'], 3)
+            df['ma_6'] = _moving_mean(df['value'], 6)
+            date_index = pd.DatetimeIndex(df['date'])
+            df['month'] = date_index.month.to_numpy()
+            df['quarter'] = date_index.quarter.to_numpy()
             
             # Remover NaN
             df = df.dropna()
@@ -65,6 +228,7 @@ class EconomicPredictor:
             
             # Separar features e target
             feature_columns = [col for col in df.columns if col not in ['date', 'value']]
+            df = df.astype({col: 'float32' for col in feature_columns})
             X = df[feature_columns]
             y = df['value']
             dates = df['date']
@@ -102,8 +266,11 @@ class EconomicPredictor:
             # Métricas básicas
             y_pred_test = model.predict(X_test_scaled)
             r2 = r2_score(y_test, y_pred_test)
-            rmse = np.sqrt(mean_squared_error(y_test, y_pred_test))
-            mae = np.mean(np.abs(y_test - y_pred_test))
+            
+            # RMSE e MAE a partir do mesmo buffer de resíduos
+            diff = np.subtract(y_test.to_numpy(dtype=np.float64), y_pred_test)
+            rmse = np.sqrt(np.dot(diff, diff) / diff.size)
+            mae = np.abs(diff, out=diff).mean()
             
             metrics = {
                 'r2': r2,
@@ -125,7 +292,7 @@ class EconomicPredictor:
             }
             
             model_path = f"{self.model_dir}/{target_indicator}_random_forest_model.pkl"
-            joblib.dump(model_data, model_path)
+            joblib.dump(model_data, model_path, compress=0)  # Sem compressão: permite mmap na carga
             print(f"✅ Modelo salvo: {model_path}")
             
             return metrics
@@ -136,7 +303,12 @@ class EconomicPredictor:
             return None
     
     def predict_future(self, target_indicator, steps=6):
-        """Previsão simples e robusta"""
+        """Previsão simples e robusta
+        
+        Args:
+            target_indicator: Indicador a prever
+            steps: Número de meses à frente
+        """
         try:
             print(f"🔮 Prevendo {target_indicator}...")
             
@@ -146,9 +318,7 @@ class EconomicPredictor:
                 print(f"❌ Modelo não encontrado: {model_path}")
                 return None
             
-            model_data = joblib.load(model_path)
-            model = model_data['model']
-            scaler = model_data['scaler']
+            model_data = _load_model_data(model_path, os.path.getmtime(model_path))
             feature_columns = model_data['feature_columns']
             
             # Preparar dados históricos
@@ -163,23 +333,57 @@ class EconomicPredictor:
             
             X_aligned = X[feature_columns]
             
-            # Gerar previsões
-            predictions = []
-            prediction_dates = []
+            # Posições das features no vetor de estado
+            feature_index = {name: i for i, name in enumerate(feature_columns)}
+            lag_features = [
+                (int(name[4:]), i) for name, i in feature_index.items()
+                if name.startswith('lag_') and name[4:].isdigit()
+            ]
+            lag_pos = np.array([i for _, i in lag_features], dtype=np.intp)
+            lag_src = np.array([lag - 1 for lag, _ in lag_features], dtype=np.intp)
+            max_lag = max([lag for lag, _ in lag_features], default=0)
+            
+            # Escalonamento inline, sem a validação do sklearn a cada passo
+            mean_ = model_data['scaler_mean']
+            inv_scale_ = model_data['scaler_inv_scale']
+            
+            # Estado em NumPy a partir da última linha; histórico com os
+            # valores mais recentes, alimentado pelas próprias previsões
+            state = X_aligned.iloc[-1].to_numpy(dtype=np.float64)
+            history = deque(y.to_numpy(dtype=np.float64)[-max(max_lag, 6):], maxlen=max(max_lag, 6))
+            
+            # Datas das previsões
             base_date = dates.iloc[-1]
-            
-            # Usar última linha como base
-            base_features = X_aligned.iloc[-1:].copy()
-            
-            for step in range(steps):
+            prediction_dates = _add_months(base_date, steps)
+            months = prediction_dates.month.to_numpy()
+            quarters = prediction_dates.quarter.to_numpy()
+            
+            def predict_rows(rows):
+                return _predict_rows(model_data, (rows - mean_) * inv_scale_)
+            
+            def advance_state(recent):
+                # Defasagens e médias móveis a partir do histórico
+                # (recent[0] é o valor mais recente)
+                state[lag_pos] = recent[lag_src]
+                if 'ma_3' in feature_index:
+                    state[feature_index['ma_3']] = recent[:3].mean()
+                if 'ma_6' in feature_index:
+                    state[feature_index['ma_6']] = recent[:6].mean()
+            
+            # Previsão recursiva: cada valor previsto alimenta as defasagens
+            # e médias móveis do passo seguinte
+            predictions = []
+            for month, quarter in zip(months, quarters):
+                advance_state(np.array(history)[::-1])
+                if 'month' in feature_index:
+                    state[feature_index['month']] = month
+                if 'quarter' in feature_index:
+                    state[feature_index['quarter']] = quarter
+                
                 # Escalar e prever
-                scaled = scaler.transform(base_features)
-                pred = model.predict(scaled)[0]
+                pred = float(predict_rows(state.reshape(1, -1))[0])
                 predictions.append(pred)
-                
-                # Próxima data
-                next_date = base_date + pd.DateOffset(months=step+1)
-                prediction_dates.append(next_date)
+                history.append(pred)
             
             # Resultado
             future_df = pd.DataFrame({
@@ -204,7 +408,7 @@ class EconomicPredictor:
                 print(f"❌ Modelo não encontrado para análise: {model_path}")
                 return None
             
-            model_data = joblib.load(model_path)
+            model_data = _load_model_data(model_path, os.path.getmtime(model_path))
             model = model_data['model']
             feature_columns = model_data['feature_columns']
             
@@ -1,6 +1,7 @@
 # modules/dashboard_module.py
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
@@ -11,12 +12,280 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Nomes de exibição calculados uma vez por processo (somente leitura)
+_INDICATOR_NAMES = get_indicator_display_names()
+
+# Máximo de pontos por série enviados ao Plotly
+_PLOT_MAX_POINTS = 2000
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Seleciona pontos pelo Largest-Triangle-Three-Buckets (LTTB)
+    
+    Mantém o primeiro e o último ponto e, em cada balde intermediário, o ponto
+    que forma o maior triângulo com o ponto escolhido antes e a média do
+    balde seguinte, preservando picos e vales da série.
+    
+    Args:
+        x: Eixo x numérico (ex: datas em int64)
+        y: Valores
+        n_out: Quantidade de pontos desejada
+    
+    Returns:
+        Array com os índices selecionados, em ordem crescente
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    
+    indices = np.empty(n_out, dtype=np.intp)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+    
+    return indices
+
+def _downsample(data: pd.DataFrame, max_points: int = _PLOT_MAX_POINTS) -> pd.DataFrame:
+    """Reduz a série a no máximo max_points linhas (LTTB) para plotagem"""
+    if len(data) <= max_points:
+        return data
+    x = data.index.to_numpy(dtype='datetime64[ns]').astype(np.int64)
+    return data.iloc[_lttb_indices(x, data['value'].to_numpy(), max_points)]
+
+def _ols_fit(x: np.ndarray, y: np.ndarray):
+    """
+    Regressão linear simples (y = slope * x + intercept) sem passar pelo LAPACK
+    
+    Args:
+        x: Abscissas (float64)
+        y: Ordenadas (float64)
+    
+    Returns:
+        Tupla (slope, intercept)
+    """
+    
+    # Centralizar antes dos produtos evita perda de precisão com datas em segundos
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    sxx = np.dot(dx, dx)
+    slope = np.dot(dx, y - y_mean) / sxx if sxx else 0.0
+    return slope, y_mean - slope * x_mean
+
+def _resample_series(data: pd.DataFrame, resample: str = None) -> pd.DataFrame:
+    """Médias por período (ex: 'MS') só para plotagem; None devolve a série intacta"""
+    if not resample:
+        return data
+    return data[['value']].resample(resample).mean().dropna()
+
+@st.cache_data(ttl=600, show_spinner=False, max_entries=32)
+def _build_chart(data: pd.DataFrame, indicator: str, chart_type: str, show_trend: bool,
+                 resample: str = None):
+    """
+    Cria gráfico para um indicador, com cache entre reruns
+    
+    Args:
+        data: Série do indicador (índice de datas, coluna value)
+        indicator: Nome do indicador
+        chart_type: 'line', 'area' ou 'bar'
+        show_trend: Se True, adiciona a linha de tendência (line/area)
+        resample: Frequência para plotar médias por período em line/area
+            (ex: 'MS'), ou None para a série completa
+    
+    Returns:
+        Figura Plotly
+    """
+    
+    # Séries longas reduzidas (médias por período e LTTB) antes de irem para
+    # o Plotly; as barras mostram os últimos valores originais
+    if chart_type in ('line', 'area'):
+        plot_data = _downsample(_resample_series(data, resample))
+    else:
+        plot_data = data.tail(20)
+    
+    # float32 basta para o que é serializado ao navegador
+    plot_data = plot_data.astype({'value': 'float32'})
+    
+    if chart_type == 'line':
+        fig = px.line(
+            plot_data, 
+            x=plot_data.index, 
+            y='value',
+            title=f'Evolução de {_INDICATOR_NAMES.get(indicator, indicator)}',
+            labels={'date': 'Data', 'value': 'Valor'}
+        )
+    elif chart_type == 'area':
+        fig = px.area(
+            plot_data, 
+            x=plot_data.index, 
+            y='value',
+            title=f'Evolução de {_INDICATOR_NAMES.get(indicator, indicator)}',
+            labels={'date': 'Data', 'value': 'Valor'}
+        )
+    else:  # bar
+        fig = px.bar(
+            plot_data, 
+            x=plot_data.index, 
+            y='value',
+            title=f'Últimos 20 valores - {_INDICATOR_NAMES.get(indicator, indicator)}',
+            labels={'date': 'Data', 'value': 'Valor'}
+        )
+    
+    # Adicionar linha de tendência se solicitado
+    if show_trend and chart_type in ['line', 'area'] and len(data) > 1:
+        # Reta de mínimos quadrados por fórmula fechada (datas em segundos);
+        # por ser uma reta, bastam os dois extremos no gráfico
+        xnum = data.index.to_numpy(dtype='datetime64[s]').astype(np.int64).astype(np.float64)
+        slope, intercept = _ols_fit(xnum, data['value'].to_numpy(dtype=np.float64))
+        ends = [0, -1]
+        fig.add_trace(go.Scattergl(
+            x=data.index[ends],
+            y=slope * xnum[ends] + intercept,
+            mode='lines',
+            name='Tendência',
+            line=dict(dash='dash')
+        ))
+    
+    fig.update_layout(height=400)
+    return fig
+
+@st.cache_data(ttl=300)
+def _probe_indicators(keys: tuple, db_path: str) -> dict:
+    """
+    Verifica quais indicadores têm dados, com uma única consulta de existência
+    
+    Args:
+        keys: Indicadores a verificar (tupla, para ser hasheável pelo cache)
+        db_path: Caminho do banco de dados
+    
+    Returns:
+        Dict {indicador: nome para exibição} dos indicadores com dados
+    """
+    present = DatabaseManager(db_path).list_nonempty_indicators()
+    return {
+        indicator: config.data_collection.indicators[indicator]['name']
+        for indicator in keys
+        if indicator in present
+    }
+
+def _aggregate_data(data: pd.DataFrame, aggregation: str) -> pd.DataFrame:
+    """Agrega dados por período para facilitar visualização de séries longas"""
+    
+    if data is None or data.empty:
+        return data
+    
+    try:
+        # Definir frequência de agregação
+        freq_map = {
+            'monthly': 'M',
+            'quarterly': 'Q', 
+            'yearly': 'Y'
+        }
+        
+        freq = freq_map.get(aggregation, 'M')
+        
+        # Agrupar pelo período de cada data: só períodos com dados, sem
+        # enumerar os intervalos vazios como o resample
+        periods = data['date'].dt.to_period(freq)
+        aggregated = data.groupby(periods, sort=True)['value'].mean()
+        
+        # Retornar formato original, rotulado pelo último dia do período
+        result = pd.DataFrame({
+            'date': aggregated.index.to_timestamp(how='end').normalize(),
+            'value': aggregated.to_numpy()
+        })
+        result['aggregation'] = aggregation
+        
+        return result
+        
+    except Exception as e:
+        logger.error(f"Erro na agregação: {e}")
+        return data
+
+def _finish_series(data: pd.DataFrame, aggregation: str, sql_aggregation: str) -> pd.DataFrame:
+    """
+    Aplica à série carregada a agregação que não foi feita no banco e passa
+    a data para o índice (DatetimeIndex ordenado, usado por todo o dashboard)
+    """
+    if sql_aggregation:
+        data['aggregation'] = aggregation
+    elif aggregation != 'none':
+        data = _aggregate_data(data, aggregation)
+    
+    data = data.set_index('date')
+    
+    # Precisão de segundos basta para as datas; os valores seguem em float64
+    # para métricas e tabelas (só a cópia enviada ao Plotly vira float32)
+    data.index = data.index.astype('datetime64[s]')
+    return data
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _load_indicators_data_cached(indicators: tuple, months: int, db_path: str,
+                                 aggregation: str = 'none') -> dict:
+    """
+    Carrega do banco as séries de vários indicadores em uma única consulta,
+    com cache entre reruns
+    
+    Args:
+        indicators: Indicadores (tupla, para ser hasheável pelo cache)
+        months: Meses retroativos (0 = todo o período)
+        db_path: Caminho do banco de dados
+        aggregation: Agregação escolhida na sidebar ('none', 'monthly', ...)
+    
+    Returns:
+        Dict {indicador: DataFrame ordenado por data (já agregado)}, na ordem
+        de `indicators`; indicadores sem dados ficam de fora
+    """
+    db_manager = DatabaseManager(db_path)
+    
+    # Agregações conhecidas são calculadas no próprio SQLite
+    sql_aggregation = aggregation if aggregation in DatabaseManager.SQL_AGGREGATIONS else None
+    
+    # ✅ CARREGAR TODOS OS DADOS SE months = 0
+    if months == 0:
+        # Carregar todo o período disponível
+        frames = db_manager.load_data_multi(list(indicators), aggregation=sql_aggregation)
+    else:
+        # Carregar período específico
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=30 * months)
+        
+        frames = db_manager.load_data_multi(
+            list(indicators),
+            start_date.strftime('%Y-%m-%d'),
+            end_date.strftime('%Y-%m-%d'),
+            aggregation=sql_aggregation
+        )
+    
+    # Séries já chegam ordenadas por data e com date em datetime
+    return {
+        indicator: _finish_series(frames[indicator], aggregation, sql_aggregation)
+        for indicator in indicators
+        if indicator in frames and not frames[indicator].empty
+    }
+
 class DashboardModule(BaseModule):
     """Módulo do dashboard econômico"""
     
     def __init__(self):
-        self.db_manager = DatabaseManager()
-        self.indicator_names = get_indicator_display_names()
+        # Gerenciador (e engine SQLAlchemy) reaproveitado entre reruns da sessão
+        if 'db_manager' not in st.session_state:
+            st.session_state.db_manager = DatabaseManager()
+        self.db_manager = st.session_state.db_manager
     
     def render(self):
         st.title("📊 Dashboard Econômico - Dados do Banco Central")
@@ -49,29 +318,25 @@ class DashboardModule(BaseModule):
         
         # Mostrar gráficos
         if selected_indicators:
+            # Carregar uma única vez (e em uma só consulta) os dados usados
+            # por todas as seções
+            all_data = self._load_indicators_data(selected_indicators, months)
+            
             if len(selected_indicators) == 1:
-                self._render_single_indicator(selected_indicators[0], months, chart_type)
+                self._render_single_indicator(selected_indicators[0], all_data.get(selected_indicators[0]), months, chart_type)
             else:
-                self._render_multiple_indicators(selected_indicators, months, chart_type)
+                self._render_multiple_indicators(all_data, chart_type, months)
             
             # Estatísticas comparativas
-            self._render_statistics(selected_indicators, months)
+            self._render_statistics(all_data)
         else:
             st.info("Selecione pelo menos um indicador na barra lateral.")
     
     def _get_available_indicators(self) -> dict:
         """Verifica quais indicadores têm dados disponíveis"""
-        available = {}
-        
-        for indicator, info in config.data_collection.indicators.items():
-            try:
-                data = self.db_manager.load_data(indicator)
-                if data is not None and not data.empty:
-                    available[indicator] = info['name']
-            except Exception as e:
-                logger.warning(f"Erro ao verificar dados de {indicator}: {e}")
-        
-        return available
+        return _probe_indicators(
+            tuple(config.data_collection.indicators), self.db_manager.db_path
+        )
     
     def _render_sidebar(self, available_indicators: dict):
         """Renderiza controles da sidebar"""
@@ -143,17 +408,16 @@ class DashboardModule(BaseModule):
                 'aggregation': aggregation
             })
     
-    def _render_single_indicator(self, indicator: str, months: int, chart_type: str):
+    def _render_single_indicator(self, indicator: str, data: pd.DataFrame, months: int, chart_type: str):
         """Renderiza visualização para um único indicador"""
         
-        data = self._load_indicator_data(indicator, months)
         if data is None or data.empty:
-            st.error(f"Não há dados disponíveis para {self.indicator_names.get(indicator, indicator)}")
+            st.error(f"Não há dados disponíveis para {_INDICATOR_NAMES.get(indicator, indicator)}")
             return
         
         # ✅ MOSTRAR INFORMAÇÕES DO PERÍODO
         period_info = self._get_period_info(data, months)
-        st.subheader(f"📈 {self.indicator_names.get(indicator, indicator)} - {period_info}")
+        st.subheader(f"📈 {_INDICATOR_NAMES.get(indicator, indicator)} - {period_info}")
         
         # ✅ ADICIONAR INFO SOBRE AGREGAÇÃO
         aggregation = st.session_state.get('aggregation', 'none')
@@ -161,14 +425,17 @@ class DashboardModule(BaseModule):
             st.info(f"ℹ️ Dados agregados por {aggregation} para melhor visualização")
         
         # Gráfico principal
-        fig = self._create_chart(data, indicator, chart_type)
+        fig = self._create_chart(data, indicator, chart_type, self._chart_resample(months))
         st.plotly_chart(fig, use_container_width=True)
         
         # Métricas principais
         col1, col2, col3, col4 = st.columns(4)
         
-        current_value = data['value'].iloc[-1]
-        previous_value = data['value'].iloc[-2] if len(data) > 1 else current_value
+        # Uma única extração do array para valor atual, anterior e extremos
+        values = data['value'].to_numpy()
+        current_value = values[-1]
+        previous_value = values[-2] if values.size > 1 else current_value
+        max_value, min_value = values.max(), values.min()
         change = current_value - previous_value
         change_pct = (change / previous_value * 100) if previous_value != 0 else 0
         
@@ -177,9 +444,9 @@ class DashboardModule(BaseModule):
         with col2:
             st.metric("Variação %", f"{change_pct:+.2f}%")
         with col3:
-            st.metric("Máximo", f"{data['value'].max():.4f}")
+            st.metric("Máximo", f"{max_value:.4f}")
         with col4:
-            st.metric("Mínimo", f"{data['value'].min():.4f}")
+            st.metric("Mínimo", f"{min_value:.4f}")
         
         # ✅ ADICIONAR ESTATÍSTICAS HISTÓRICAS PARA PERÍODOS LONGOS
         if months >= 60:  # Para 5+ anos, mostrar análise histórica
@@ -188,9 +455,9 @@ class DashboardModule(BaseModule):
         # Tabela de dados recentes
         if st.session_state.get('show_stats', True):
             with st.expander("📋 Dados Recentes"):
-                recent_data = data.tail(10).sort_values('date', ascending=False)
-                recent_data['date'] = recent_data['date'].dt.strftime('%d/%m/%Y')
-                st.dataframe(recent_data[['date', 'value']], use_container_width=True)
+                recent_data = data[['value']].tail(10).iloc[::-1]
+                recent_data.index = recent_data.index.strftime('%d/%m/%Y')
+                st.dataframe(recent_data.rename_axis('date').reset_index(), use_container_width=True)
 
 
     def _get_period_info(self, data: pd.DataFrame, months: int) -> str:
@@ -199,8 +466,9 @@ class DashboardModule(BaseModule):
         if months == 0:
             return "Todo o período disponível"
         
-        start_date = data['date'].min().strftime('%m/%Y')
-        end_date = data['date'].max().strftime('%m/%Y')
+        # Série já vem ordenada por data: extremos em O(1)
+        start_date = data.index[0].strftime('%m/%Y')
+        end_date = data.index[-1].strftime('%m/%Y')
         total_points = len(data)
         
         return f"{start_date} a {end_date} ({total_points} pontos)"
@@ -213,10 +481,8 @@ class DashboardModule(BaseModule):
         col1, col2 = st.columns(2)
         
         with col1:
-            # Estatísticas por ano
-            data_yearly = data.copy()
-            data_yearly['year'] = data_yearly['date'].dt.year
-            yearly_stats = data_yearly.groupby('year')['value'].agg([
+            # Estatísticas por ano (agrupando pelo acessor de data, sem cópia)
+            yearly_stats = data.groupby(data.index.year.rename('year'))['value'].agg([
                 'mean', 'min', 'max', 'std'
             ]).round(4)
             
@@ -225,9 +491,7 @@ class DashboardModule(BaseModule):
         
         with col2:
             # Volatilidade por período
-            data_monthly = data.copy()
-            data_monthly['month'] = data_monthly['date'].dt.to_period('M')
-            monthly_vol = data_monthly.groupby('month')['value'].std()
+            monthly_vol = data.groupby(data.index.to_period('M'))['value'].std()
             
             avg_volatility = monthly_vol.mean()
             max_volatility = monthly_vol.max()
@@ -241,22 +505,15 @@ class DashboardModule(BaseModule):
             min_idx = data['value'].idxmin()
             
             st.markdown("**🏆 Extremos Históricos:**")
-            st.write(f"Maior valor: {data.loc[max_idx, 'value']:.4f} em {data.loc[max_idx, 'date'].strftime('%m/%Y')}")
-            st.write(f"Menor valor: {data.loc[min_idx, 'value']:.4f} em {data.loc[min_idx, 'date'].strftime('%m/%Y')}")
+            st.write(f"Maior valor: {data['value'].max():.4f} em {max_idx.strftime('%m/%Y')}")
+            st.write(f"Menor valor: {data['value'].min():.4f} em {min_idx.strftime('%m/%Y')}")
 
 
     
-    def _render_multiple_indicators(self, indicators: list, months: int, chart_type: str):
-        """Renderiza visualização para múltiplos indicadores"""
-        
-        st.subheader(f"📊 Comparação de Indicadores ({len(indicators)} selecionados)")
+    def _render_multiple_indicators(self, all_data: dict, chart_type: str, months: int):
+        """Renderiza visualização para múltiplos indicadores já carregados"""
         
-        # Carregar dados de todos os indicadores
-        all_data = {}
-        for indicator in indicators:
-            data = self._load_indicator_data(indicator, months)
-            if data is not None and not data.empty:
-                all_data[indicator] = data
+        st.subheader(f"📊 Comparação de Indicadores ({len(all_data)} selecionados)")
         
         if not all_data:
             st.error("Nenhum dado disponível para os indicadores selecionados")
@@ -264,25 +521,37 @@ class DashboardModule(BaseModule):
         
         # Criar gráfico combinado
         fig = go.Figure()
+        resample = self._chart_resample(months)
         
         for indicator, data in all_data.items():
+            data = _resample_series(data, resample)
+            
             # Normalizar dados se solicitado
             values = data['value']
             if st.session_state.get('normalize_data', False):
                 values = (values - values.min()) / (values.max() - values.min())
             
+            # Só os pontos que fazem diferença visual vão para o navegador
+            if len(data) > _PLOT_MAX_POINTS:
+                x = data.index.to_numpy(dtype='datetime64[ns]').astype(np.int64)
+                keep = _lttb_indices(x, values.to_numpy(), _PLOT_MAX_POINTS)
+                data, values = data.iloc[keep], values.iloc[keep]
+            
+            # float32 só na série enviada ao Plotly
+            values = values.astype('float32')
+            
             if chart_type == 'line':
-                fig.add_trace(go.Scatter(
-                    x=data['date'],
+                fig.add_trace(go.Scattergl(
+                    x=data.index,
                     y=values,
-                    name=self.indicator_names.get(indicator, indicator),
+                    name=_INDICATOR_NAMES.get(indicator, indicator),
                     mode='lines'
                 ))
             elif chart_type == 'area':
-                fig.add_trace(go.Scatter(
-                    x=data['date'],
+                fig.add_trace(go.Scattergl(
+                    x=data.index,
                     y=values,
-                    name=self.indicator_names.get(indicator, indicator),
+                    name=_INDICATOR_NAMES.get(indicator, indicator),
                     fill='tonexty' if len(fig.data) > 0 else 'tozeroy'
                 ))
         
@@ -304,54 +573,65 @@ class DashboardModule(BaseModule):
         
         st.subheader("📊 Resumo Comparativo")
         
-        summary_data = []
-        for indicator, data in all_data.items():
-            values = data['value']
-            summary_data.append({
-                'Indicador': self.indicator_names.get(indicator, indicator),
-                'Último Valor': f"{values.iloc[-1]:.4f}",
-                'Média': f"{values.mean():.4f}",
-                'Desvio Padrão': f"{values.std():.4f}",
-                'Mínimo': f"{values.min():.4f}",
-                'Máximo': f"{values.max():.4f}",
-                'Variação %': f"{((values.iloc[-1] / values.iloc[0] - 1) * 100):+.2f}%" if len(values) > 1 else "N/A"
-            })
+        # Estatísticas de todos os indicadores em uma única agregação
+        values = pd.concat({indicator: data['value'] for indicator, data in all_data.items()}, names=['indicator'])
+        stats = values.groupby(level='indicator', sort=False).agg(['first', 'last', 'mean', 'std', 'min', 'max', 'count'])
+        var_pct = (stats['last'] / stats['first'] - 1) * 100
+        
+        summary_data = {
+            'Indicador': [_INDICATOR_NAMES.get(indicator, indicator) for indicator in stats.index],
+            'Último Valor': stats['last'].map('{:.4f}'.format),
+            'Média': stats['mean'].map('{:.4f}'.format),
+            'Desvio Padrão': stats['std'].map('{:.4f}'.format),
+            'Mínimo': stats['min'].map('{:.4f}'.format),
+            'Máximo': stats['max'].map('{:.4f}'.format),
+            'Variação %': var_pct.map('{:+.2f}%'.format).where(stats['count'] > 1, "N/A")
+        }
         
-        summary_df = pd.DataFrame(summary_data)
+        summary_df = pd.DataFrame(summary_data).reset_index(drop=True)
         st.dataframe(summary_df, use_container_width=True)
     
-    def _render_statistics(self, indicators: list, months: int):
-        """Renderiza seção de estatísticas"""
+    def _render_statistics(self, all_data: dict):
+        """Renderiza seção de estatísticas a partir dos dados já carregados"""
         
         if not st.session_state.get('show_stats', True):
             return
         
         st.subheader("📈 Análise Estatística")
         
-        # Carregar dados
-        all_data = {}
-        for indicator in indicators:
-            data = self._load_indicator_data(indicator, months)
-            if data is not None and not data.empty:
-                all_data[indicator] = data['value']
-        
         if len(all_data) < 2:
             return
         
-        # Criar DataFrame combinado
-        combined_df = pd.DataFrame(all_data)
+        # Alinhar todas as séries pela data com um único outer join
+        combined_df = pd.concat(
+            {
+                indicator: data['value'][~data.index.duplicated(keep='last')]
+                for indicator, data in all_data.items()
+            },
+            axis=1,
+            join='outer'
+        )
+        stack = combined_df.to_numpy(dtype=np.float64)
+        columns = list(combined_df.columns)
         
         # Matriz de correlação
-        if len(combined_df.columns) > 1:
+        if len(columns) > 1:
             st.markdown("#### 🔗 Matriz de Correlação")
             
-            corr_matrix = combined_df.corr()
+            if np.isfinite(stack).all():
+                # Sem lacunas: correlação direta em NumPy
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    corr_values = np.corrcoef(stack, rowvar=False)
+                corr_matrix = pd.DataFrame(corr_values, index=columns, columns=columns)
+            else:
+                # Frequências diferentes deixam lacunas: correlação par a par
+                corr_matrix = pd.DataFrame(stack, columns=columns).corr()
             
             fig = px.imshow(
                 corr_matrix,
                 labels=dict(x="Indicador", y="Indicador", color="Correlação"),
-                x=[self.indicator_names.get(col, col) for col in corr_matrix.columns],
-                y=[self.indicator_names.get(col, col) for col in corr_matrix.index],
+                x=[_INDICATOR_NAMES.get(col, col) for col in corr_matrix.columns],
+                y=[_INDICATOR_NAMES.get(col, col) for col in corr_matrix.index],
                 color_continuous_scale='RdBu',
                 aspect='auto'
             )
@@ -359,118 +639,46 @@ class DashboardModule(BaseModule):
             fig.update_layout(height=400)
             st.plotly_chart(fig, use_container_width=True)
     
-    def _load_indicator_data(self, indicator: str, months: int) -> pd.DataFrame:
-        """Carrega dados de um indicador para o período especificado"""
-        
-        try:
-            # ✅ CARREGAR TODOS OS DADOS SE months = 0
-            if months == 0:
-                # Carregar todo o período disponível
-                data = self.db_manager.load_data(indicator)
-            else:
-                # Carregar período específico
-                end_date = datetime.now()
-                start_date = end_date - timedelta(days=30 * months)
-                
-                data = self.db_manager.load_data(
-                    indicator,
-                    start_date.strftime('%Y-%m-%d'),
-                    end_date.strftime('%Y-%m-%d')
-                )
-            
-            if data is not None and not data.empty:
-                # Garantir que a coluna date seja datetime
-                data['date'] = pd.to_datetime(data['date'])
-                data = data.sort_values('date')
-                
-                # ✅ APLICAR AGREGAÇÃO SE NECESSÁRIO
-                aggregation = st.session_state.get('aggregation', 'none')
-                if aggregation != 'none':
-                    data = self._aggregate_data(data, aggregation)
-                
-                return data
-            
-        except Exception as e:
-            logger.error(f"Erro ao carregar dados de {indicator}: {e}")
-            st.error(f"🐛 Debug: Erro ao carregar {indicator}: {e}")
+    def _load_indicators_data(self, indicators: list, months: int) -> dict:
+        """
+        Carrega os dados de vários indicadores para o período especificado
         
-        return None
-    
-
-    def _aggregate_data(self, data: pd.DataFrame, aggregation: str) -> pd.DataFrame:
-        """Agrega dados por período para facilitar visualização de séries longas"""
+        Args:
+            indicators: Lista de indicadores
+            months: Meses retroativos (0 = todo o período)
         
-        if data is None or data.empty:
-            return data
+        Returns:
+            Dict {indicador: DataFrame} só com os indicadores que têm dados
+        """
         
         try:
-            # Definir frequência de agregação
-            freq_map = {
-                'monthly': 'M',
-                'quarterly': 'Q', 
-                'yearly': 'Y'
-            }
-            
-            freq = freq_map.get(aggregation, 'M')
-            
-            # Configurar data como índice
-            data_copy = data.copy()
-            data_copy.set_index('date', inplace=True)
-            
-            # Agregar por média
-            aggregated = data_copy.resample(freq)['value'].agg([
-                ('value', 'mean'),
-                ('min_value', 'min'),
-                ('max_value', 'max'),
-                ('count', 'count')
-            ]).reset_index()
+            aggregation = st.session_state.get('aggregation', 'none')
             
-            # Manter apenas registros com dados suficientes
-            aggregated = aggregated[aggregated['count'] > 0]
-            
-            # Retornar formato original
-            result = aggregated[['date', 'value']].copy()
-            result['aggregation'] = aggregation
-            
-            return result
+            # Leitura, conversão e agregação em cache por
+            # (indicadores, período, agregação)
+            return _load_indicators_data_cached(
+                tuple(indicators), months, self.db_manager.db_path, aggregation
+            )
             
         except Exception as e:
-            logger.error(f"Erro na agregação: {e}")
-            return data
-    
-    def _create_chart(self, data: pd.DataFrame, indicator: str, chart_type: str):
-        """Cria gráfico para um indicador"""
-        
-        if chart_type == 'line':
-            fig = px.line(
-                data, 
-                x='date', 
-                y='value',
-                title=f'Evolução de {self.indicator_names.get(indicator, indicator)}',
-                labels={'date': 'Data', 'value': 'Valor'}
-            )
-        elif chart_type == 'area':
-            fig = px.area(
-                data, 
-                x='date', 
-                y='value',
-                title=f'Evolução de {self.indicator_names.get(indicator, indicator)}',
-                labels={'date': 'Data', 'value': 'Valor'}
-            )
-        else:  # bar
-            fig = px.bar(
-                data.tail(20), 
-                x='date', 
-                y='value',
-                title=f'Últimos 20 valores - {self.indicator_names.get(indicator, indicator)}',
-                labels={'date': 'Data', 'value': 'Valor'}
-            )
+            logger.error(f"Erro ao carregar dados de {indicators}: {e}")
+            st.error(f"🐛 Debug: Erro ao carregar {indicators}: {e}")
         
-        # Adicionar linha de tendência se solicitado
-        if st.session_state.get('show_trend', True) and chart_type in ['line', 'area']:
-            fig.add_trace(
-                px.scatter(data, x='date', y='value', trendline='ols').data[1]
-            )
-        
-        fig.update_layout(height=400)
-        return fig
\ No newline at end of file
+        return {}
+    
+    def _chart_resample(self, months: int, resample: str = 'MS'):
+        """
+        Frequência de reamostragem dos gráficos de linha/área
+        
+        Períodos longos sem opção de agregação na sidebar (2 a 5 anos e todo
+        o período) são plotados com um ponto por mês; métricas e tabelas
+        continuam usando a série original.
+        """
+        long_period = months == 0 or 24 <= months < 60
+        if long_period and st.session_state.get('aggregation', 'none') == 'none':
+            return resample
+        return None
+    
+    def _create_chart(self, data: pd.DataFrame, indicator: str, chart_type: str, resample: str = None):
+        """Cria gráfico para um indicador (figura em cache por dados e opções)"""
+        return _build_chart(data, indicator, chart_type, st.session_state.get('show_trend', True), resample)
\ No newline at end of file
@@ -9,6 +9,26 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+@st.cache_resource
+def _get_collector() -> BCBDataCollector:
+    """Coletor compartilhado entre reruns (mantém o pool de conexões HTTP)"""
+    return BCBDataCollector()
+
+@st.cache_resource
+def _get_db_manager() -> DatabaseManager:
+    """Gerenciador do banco compartilhado entre reruns"""
+    return DatabaseManager()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_api_status() -> bool:
+    """Status da API do BCB, consultado no máximo uma vez por minuto"""
+    return _get_collector().check_api_status()
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_record_counts(indicators: tuple) -> dict:
+    """Registros por indicador, contados no banco em uma única consulta"""
+    return _get_db_manager().count_records(list(indicators))
+
 class DataCollectionModule(BaseModule):
     """Módulo para coleta de dados do BCB"""
     
@@ -96,10 +116,13 @@ class DataCollectionModule(BaseModule):
         """Mostra status da API do BCB"""
         st.subheader("🌐 Status da Conexão")
         
+        # O status fica em cache por 60s; o botão força uma nova verificação
+        if st.button("🔄 Verificar novamente", key="recheck_api_status"):
+            _cached_api_status.clear()
+        
         with st.container():
             try:
-                collector = BCBDataCollector()
-                api_ok = collector.check_api_status()
+                api_ok = _cached_api_status()
                 
                 if api_ok:
                     st.success("🟢 API do Banco Central está online e respondendo")
@@ -152,8 +175,8 @@ class DataCollectionModule(BaseModule):
             status_text = st.empty()
             
             try:
-                collector = BCBDataCollector()
-                db_manager = DatabaseManager()
+                collector = _get_collector()
+                db_manager = _get_db_manager()
                 
                 total_indicators = len(indicators)
                 
@@ -167,25 +190,30 @@ class DataCollectionModule(BaseModule):
                 progress_bar.progress(0.1)
                 status_text.text("📊 Coletando dados dos indicadores...")
                 
-                # Coletar dados
+                # Coletar dados (requisições em paralelo; a barra avança a cada
+                # indicador concluído, entre 10% e 70%)
+                def update_progress(done: int, total: int):
+                    progress_bar.progress(0.1 + 0.6 * done / total)
+                    status_text.text(f"📊 Coletando dados dos indicadores... ({done}/{total})")
+                
                 data_results = collector.collect_all_data(
                     last_n_years=int(years) if years >= 1 else None,
-                    indicators=indicators
+                    indicators=indicators,
+                    on_progress=update_progress
                 )
                 
                 progress_bar.progress(0.7)
                 status_text.text("💾 Salvando dados no banco...")
                 
-                # Salvar no banco
-                saved_results = {}
-                for i, (indicator, df) in enumerate(data_results.items()):
-                    if df is not None and not df.empty:  # ✅ Verificação adicional
-                        success = db_manager.save_data(indicator, df)  # ✅ ORDEM CORRETA
-                        saved_results[indicator] = success
-                    else:
-                        saved_results[indicator] = False  # ✅ Marcar como falha
-                    
-                    progress_bar.progress(0.7 + (0.3 * (i + 1) / len(data_results)))
+                # Salvar no banco, todos os indicadores em uma única transação
+                # (DataFrames vazios ou None são marcados como falha)
+                def update_save_progress(done: int, total: int):
+                    progress_bar.progress(0.7 + 0.3 * done / total)
+                
+                saved_results = db_manager.save_many(data_results, on_progress=update_save_progress)
+                
+                # Dados novos no banco: descartar sondagens e cargas em cache
+                st.cache_data.clear()
                 
                 progress_bar.progress(1.0)
                 status_text.text("✅ Coleta concluída com sucesso!")
@@ -196,10 +224,9 @@ class DataCollectionModule(BaseModule):
                 # Atualizar sessão
                 st.session_state.last_data_update = datetime.now().strftime("%d/%m/%Y %H:%M")
                 
-                # Limpar progresso após 3 segundos
-                import time
-                time.sleep(2)
-                progress_container.empty()
+                # Resultados já exibidos: remover a barra sem bloquear o rerun
+                # (a mensagem de conclusão permanece)
+                progress_bar.empty()
                 
             except Exception as e:
                 st.error(f"❌ Erro durante coleta: {e}")
@@ -250,15 +277,21 @@ class DataCollectionModule(BaseModule):
                 if df is not None and not df.empty:
                     col1, col2 = st.columns(2)
                     
+                    # Estatísticas calculadas uma única vez: o coletor entrega a
+                    # série ordenada por data, então o período vem dos extremos
+                    values = df['value']
+                    valid_count = values.count()
+                    dates = df['date']
+                    
                     with col1:
                         st.write("**📊 Estatísticas:**")
                         st.write(f"• Registros coletados: {len(df)}")
-                        st.write(f"• Período: {df['date'].min().strftime('%d/%m/%Y')} a {df['date'].max().strftime('%d/%m/%Y')}")
-                        st.write(f"• Valores válidos: {df['value'].notna().sum()}")
+                        st.write(f"• Período: {dates.iloc[0].strftime('%d/%m/%Y')} a {dates.iloc[-1].strftime('%d/%m/%Y')}")
+                        st.write(f"• Valores válidos: {valid_count}")
                         
-                        if df['value'].notna().sum() > 0:
-                            st.write(f"• Último valor: {df['value'].iloc[-1]:.4f}")
-                            st.write(f"• Média do período: {df['value'].mean():.4f}")
+                        if valid_count > 0:
+                            st.write(f"• Último valor: {values.iloc[-1]:.4f}")
+                            st.write(f"• Média do período: {values.mean():.4f}")
                     
                     with col2:
                         st.write("**💾 Status do Banco:**")
@@ -274,9 +307,11 @@ class DataCollectionModule(BaseModule):
                     
                     # Prévia dos dados
                     st.write("**👀 Últimos 5 registros:**")
-                    preview_data = df.tail().sort_values('date', ascending=False).copy()
-                    preview_data['date'] = preview_data['date'].dt.strftime('%d/%m/%Y')
-                    st.dataframe(preview_data[['date', 'value']], use_container_width=True)
+                    # Recorte das 5 linhas e 2 colunas antes de formatar; série já
+                    # ordenada por data, basta inverter o final
+                    preview_data = df.iloc[:-6:-1][['date', 'value']]
+                    preview_data = preview_data.assign(date=preview_data['date'].dt.strftime('%d/%m/%Y'))
+                    st.dataframe(preview_data, use_container_width=True)
                     
                 else:
                     st.error("❌ Nenhum dado coletado")
@@ -290,7 +325,7 @@ class DataCollectionModule(BaseModule):
         with test_container:
             with st.spinner("🔍 Testando conexão com API do BCB..."):
                 try:
-                    collector = BCBDataCollector()
+                    collector = _get_collector()
                     
                     # Teste básico de status
                     api_ok = collector.check_api_status()
@@ -355,17 +390,9 @@ class DataCollectionModule(BaseModule):
         with col2:
             # Verificar dados no banco
             try:
-                db_manager = DatabaseManager()
-                
-                # Contar registros por indicador
-                indicator_counts = {}
-                for indicator in config.data_collection.indicators.keys():
-                    try:
-                        data = db_manager.load_data(indicator)
-                        if data is not None:
-                            indicator_counts[indicator] = len(data)
-                    except:
-                        indicator_counts[indicator] = 0
+                # Contar registros por indicador (COUNT(*) no banco, sem
+                # carregar as séries; o cache é limpo ao fim de cada coleta)
+                indicator_counts = _cached_record_counts(tuple(config.data_collection.indicators))
                 
                 total_records = sum(indicator_counts.values())
                 indicators_with_data = len([k for k, v in indicator_counts.items() if v > 0])
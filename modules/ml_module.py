@@ -64,17 +64,17 @@ class MLModule(BaseModule):
     
     def _get_available_indicators(self) -> dict:
         """Verifica indicadores com dados suficientes para ML"""
-        available = {}
+        indicators = config.data_collection.indicators
         
-        for indicator, info in config.data_collection.indicators.items():
-            try:
-                data = self.db_manager.load_data(indicator)
-                if data is not None and len(data) >= config.ml.min_data_points:
-                    available[indicator] = info['name']
-            except Exception as e:
-                logger.warning(f"Erro ao verificar dados de {indicator}: {e}")
+        # Contagem de todos os indicadores em uma única consulta, sem
+        # carregar as séries
+        counts = self.db_manager.count_records(list(indicators))
         
-        return available
+        return {
+            indicator: info['name']
+            for indicator, info in indicators.items()
+            if counts.get(indicator, 0) >= config.ml.min_data_points
+        }
     
     def _render_training_tab(self, available_indicators: dict):
         """Tab de treinamento de modelos"""
@@ -103,6 +103,76 @@ class TestDatabaseModule(unittest.TestCase):
         self.assertEqual(len(loaded_data), 3)
         self.assertAlmostEqual(loaded_data.iloc[0]['value'], 10.5, places=2)
 
+class TestDatabaseBatchSave(unittest.TestCase):
+    """Testes para a gravação em lote (save_many) do DatabaseManager"""
+    
+    def setUp(self):
+        """Banco novo em diretório temporário (tabelas criadas no __init__)"""
+        from database_manager import DatabaseManager
+        
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        self.db_manager = DatabaseManager(self.db_path)
+    
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _rows(self, table):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute(f"SELECT date, value FROM {table} ORDER BY date").fetchall()
+        finally:
+            conn.close()
+    
+    def test_upsert_existing_date(self):
+        """Data já gravada é atualizada, sem duplicar a linha"""
+        first = pd.DataFrame({
+            'date': pd.to_datetime(['2023-01-01', '2023-02-01']),
+            'value': [1.0, 2.0]
+        })
+        second = pd.DataFrame({
+            'date': pd.to_datetime(['2023-02-01', '2023-03-01']),
+            'value': [20.0, 3.0]
+        })
+        
+        self.assertTrue(self.db_manager.save_data('ipca', first))
+        self.assertTrue(self.db_manager.save_data('ipca', second))
+        
+        self.assertEqual(
+            self._rows('ipca'),
+            [('2023-01-01', 1.0), ('2023-02-01', 20.0), ('2023-03-01', 3.0)]
+        )
+    
+    def test_duplicate_dates_last_value_wins(self):
+        """Datas repetidas no mesmo DataFrame ficam com o último valor"""
+        data = pd.DataFrame({
+            'date': pd.to_datetime(['2023-01-01', '2023-01-01', '2023-01-01']),
+            'value': [1.0, 2.0, 3.0]
+        })
+        
+        self.assertTrue(self.db_manager.save_data('selic', data))
+        self.assertEqual(self._rows('selic'), [('2023-01-01', 3.0)])
+    
+    def test_failing_table_does_not_discard_others(self):
+        """Falha em uma tabela (NaN em coluna NOT NULL) preserva as demais"""
+        good = pd.DataFrame({
+            'date': pd.to_datetime(['2023-01-01', '2023-02-01']),
+            'value': [4.5, 4.6]
+        })
+        bad = pd.DataFrame({
+            'date': pd.to_datetime(['2023-01-01', '2023-02-01']),
+            'value': [1.0, np.nan]
+        })
+        
+        results = self.db_manager.save_many({'ipca': good, 'pib': bad, 'selic': good})
+        
+        self.assertEqual(results, {'ipca': True, 'pib': False, 'selic': True})
+        self.assertEqual(self._rows('ipca'), [('2023-01-01', 4.5), ('2023-02-01', 4.6)])
+        self.assertEqual(self._rows('selic'), [('2023-01-01', 4.5), ('2023-02-01', 4.6)])
+        self.assertEqual(self._rows('pib'), [])
+
 class TestDataCollectorModule(unittest.TestCase):
     """Testes para o módulo de coleta de dados"""
     
@@ -180,7 +250,7 @@ class TestMachineLearningModule(unittest.TestCase):
         
         # Mock do database manager
         class MockDBManager:
-            def load_data(self, indicator):
+            def load_data(self, indicator, **kwargs):
                 return synthetic_data
         
         self.predictor.db_manager = MockDBManager()
@@ -209,7 +279,7 @@ class TestMachineLearningModule(unittest.TestCase):
         
         # Mock do database manager
         class MockDBManager:
-            def load_data(self, indicator):
+            def load_data(self, indicator, **kwargs):
                 return synthetic_data
         
         self.predictor.db_manager = MockDBManager()
@@ -239,6 +309,58 @@ class TestMachineLearningModule(unittest.TestCase):
             self.assertIn('importance', importance_df.columns)
             self.assertGreater(len(importance_df), 0)
 
+    def test_flat_forest_prediction(self):
+        """Testa se a floresta achatada reproduz o predict do sklearn"""
+        from sklearn.ensemble import RandomForestRegressor
+        from ml_models import _flatten_forest, _forest_predict
+        
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(200, 5))
+        y = X[:, 0] * 2 + np.sin(X[:, 1])
+        model = RandomForestRegressor(n_estimators=10, random_state=0).fit(X, y)
+        
+        flat = _flatten_forest(model)
+        np.testing.assert_allclose(_forest_predict(flat, X), model.predict(X))
+
+class TestDashboardHelpers(unittest.TestCase):
+    """Testes para as funções numéricas do dashboard (LTTB e tendência)"""
+    
+    def setUp(self):
+        """Importa as funções do módulo do dashboard"""
+        try:
+            from modules.dashboard_module import _lttb_indices, _ols_fit
+            self.lttb_indices = _lttb_indices
+            self.ols_fit = _ols_fit
+        except ImportError:
+            self.skipTest("Módulo do dashboard não disponível")
+    
+    def test_lttb_indices(self):
+        """LTTB devolve n_out índices crescentes, com extremos e picos isolados"""
+        n, n_out, spike = 1000, 50, 537
+        x = np.arange(n, dtype=np.int64) * 86400
+        y = np.sin(np.linspace(0, 6 * np.pi, n))
+        y[spike] = 25.0
+        
+        indices = self.lttb_indices(x, y, n_out)
+        
+        self.assertEqual(len(indices), n_out)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        self.assertEqual(indices[0], 0)
+        self.assertEqual(indices[-1], n - 1)
+        self.assertIn(spike, indices)
+    
+    def test_ols_fit_matches_polyfit(self):
+        """Regressão em fórmula fechada igual ao np.polyfit com datas em segundos"""
+        rng = np.random.default_rng(0)
+        x = (np.datetime64('2015-01-01', 's') + np.arange(120) * np.timedelta64(30, 'D')).astype(np.int64).astype(np.float64)
+        y = 0.5 + 3e-8 * (x - x[0]) + rng.normal(scale=0.1, size=x.size)
+        
+        slope, intercept = self.ols_fit(x, y)
+        expected_slope, expected_intercept = np.polyfit(x, y, 1)
+        
+        self.assertAlmostEqual(slope / expected_slope, 1.0, places=7)
+        np.testing.assert_allclose(slope * x + intercept, expected_slope * x + expected_intercept, rtol=1e-7)
+
 class TestReportsModule(unittest.TestCase):
     """Testes para o módulo de relatórios"""
     
@@ -280,10 +402,80 @@ class TestReportsModule(unittest.TestCase):
         except Exception as e:
             self.skipTest(f"Erro na geração de relatório: {e}")
     
+    def test_trend_analysis(self):
+        """Testa regressão de tendência contra np.polyfit"""
+        dates = pd.date_range('2022-01-01', periods=24, freq='MS')
+        values = np.linspace(2.0, 8.0, 24) + np.sin(np.arange(24)) * 0.2
+        data = pd.DataFrame({'date': dates, 'value': values})
+        
+        trend = self.generator.analyzer.analyze_trend(data, 'ipca')
+        
+        days = (dates - dates[0]).days.to_numpy()
+        self.assertAlmostEqual(trend['slope'], np.polyfit(days, values, 1)[0], places=10)
+        self.assertAlmostEqual(trend['confidence'], np.corrcoef(days, values)[0, 1] ** 2, places=10)
+        self.assertAlmostEqual(trend['volatility'], np.std(values) / np.mean(values) * 100, places=10)
+    
+    def test_detect_outliers(self):
+        """Testa detecção de outliers por IQR"""
+        values = [1.0, 1.1, 0.9, 1.0, 1.2, 10.0, 1.0, np.nan, -8.0, 1.1]
+        data = pd.DataFrame({
+            'date': pd.date_range('2023-01-01', periods=len(values), freq='D'),
+            'value': values
+        })
+
+        outliers = self.generator.analyzer.detect_outliers(data)
+
+        self.assertEqual([o['value'] for o in outliers], [10.0, -8.0])
+        self.assertEqual([o['type'] for o in outliers], ['high', 'low'])
+        self.assertEqual(outliers[0]['date'], pd.Timestamp('2023-01-06'))
+        clean = data['value'].dropna()
+        self.assertAlmostEqual(outliers[0]['deviation'], abs(10.0 - clean.median()) / clean.std(), places=10)
+        
+        outliers_with_dates, dates = self.generator.analyzer.detect_outliers(data, return_dates=True)
+        self.assertEqual(len(outliers_with_dates), len(dates))
+        self.assertEqual(pd.Timestamp(dates[int(np.argmax(dates))]), pd.Timestamp('2023-01-09'))
+        
+        count, last_outlier = self.generator.analyzer.detect_outliers(data, last_only=True)
+        self.assertEqual(count, 2)
+        self.assertEqual(last_outlier, outliers[1])
+
+    def test_correlation_analysis(self):
+        """Testa correlação entre indicadores contra pandas.corr"""
+        dates = pd.date_range(datetime.now() - timedelta(days=330), periods=10, freq='MS')
+        base = np.arange(10, dtype=float)
+        series = {
+            'ipca': base + np.array([0.1, -0.2, 0.3, 0.0, 0.2, -0.1, 0.4, 0.1, -0.3, 0.2]),
+            'selic': -base + np.array([0.3, 0.1, -0.2, 0.2, 0.0, 0.1, -0.1, 0.3, 0.2, 0.0]),
+            'pib': np.array([1.0, 0.5, 1.2, 0.8, 1.1, 0.4, 0.9, 1.3, 0.6, 1.0])
+        }
+        
+        # Mock do database manager
+        class MockDBManager:
+            def load_data(self, indicator, start_date=None, end_date=None):
+                return pd.DataFrame({'date': dates, 'value': series[indicator]})
+            
+            def load_data_multi(self, indicators, start_date=None, end_date=None):
+                return {indicator: self.load_data(indicator) for indicator in indicators}
+        
+        self.generator.analyzer.db_manager = MockDBManager()
+        
+        correlations = self.generator.analyzer.analyze_correlation(['ipca', 'selic', 'pib'])
+        
+        expected = pd.DataFrame(series).corr()
+        self.assertIn('ipca_selic', correlations)
+        self.assertAlmostEqual(correlations['ipca_selic']['correlation'], expected.loc['ipca', 'selic'], places=10)
+        self.assertEqual(correlations['ipca_selic']['direction'], 'negative')
+        self.assertEqual(correlations['ipca_selic']['strength'], 'very_strong')
+        self.assertNotIn('selic_ipca', correlations)
+    
     def test_json_export(self):
         """Testa exportação para JSON"""
         try:
-            report_data = {'test': 'data', 'timestamp': datetime.now().isoformat()}
+            report_data = {
+                'test': 'data',
+                'timestamp': datetime.now().isoformat(),
+                'forecast': [{'date': pd.Timestamp('2024-01-01'), 'value': np.float64(1.5), 'count': np.int64(3)}]
+            }
             json_path = self.generator.export_report_to_json(report_data)
             
             self.assertTrue(os.path.exists(json_path))
@@ -293,6 +485,8 @@ class TestReportsModule(unittest.TestCase):
                 loaded_data = json.load(f)
             
             self.assertEqual(loaded_data['test'], 'data')
+            self.assertEqual(loaded_data['forecast'][0]['date'], '2024-01-01T00:00:00')
+            self.assertEqual(loaded_data['forecast'][0]['count'], 3)
         except Exception as e:
             self.skipTest(f"Erro na exportação JSON: {e}")
 
@@ -423,8 +617,10 @@ def run_test_suite(module_filter=None, verbose=False):
     test_classes = {
         'health': TestSystemHealth,
         'database': TestDatabaseModule,
+        'database_batch': TestDatabaseBatchSave,
         'collector': TestDataCollectorModule,
         'ml': TestMachineLearningModule,
+        'dashboard': TestDashboardHelpers,
         'reports': TestReportsModule,
         'integration': TestSystemIntegration
     }
@@ -481,7 +677,7 @@ def run_test_suite(module_filter=None, verbose=False):
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Testes Automatizados do Sistema Econômico')
-    parser.add_argument('--module', choices=['health', 'database', 'collector', 'ml', 'reports', 'integration'],
+    parser.add_argument('--module', choices=['health', 'database', 'database_batch', 'collector', 'ml', 'dashboard', 'reports', 'integration'],
                        help='Executar testes de um módulo específico')
     parser.add_argument('--verbose', action='store_true', help='Saída detalhada')
     